@@ -193,6 +193,23 @@ DEFAULT_CALL_TIMEOUT_MS = COMMAND_TIMEOUT * 1000
 DEFAULT_CALL_OUTPUT_BYTES = OUTPUT_LIMIT
 
 
+def apply_call_clamps(call: ToolCall) -> ToolCall:
+    args = dict(call.args)
+    timeout_target = (
+        call.timeout_ms_override
+        if call.timeout_ms_override is not None
+        else args.get("timeout_ms", DEFAULT_CALL_TIMEOUT_MS)
+    )
+    args["timeout_ms"] = min(timeout_target, DEFAULT_CALL_TIMEOUT_MS)
+    output_target = (
+        call.max_output_bytes_override
+        if call.max_output_bytes_override is not None
+        else args.get("max_output_bytes", DEFAULT_CALL_OUTPUT_BYTES)
+    )
+    args["max_output_bytes"] = min(output_target, DEFAULT_CALL_OUTPUT_BYTES)
+    return call.model_copy(update={"args": args})
+
+
 class Orchestrator:
     def __init__(
         self,
@@ -524,20 +541,7 @@ class Orchestrator:
         }
 
     def apply_call_clamps(self, call: ToolCall) -> ToolCall:
-        args = dict(call.args)
-        timeout_target = (
-            call.timeout_ms_override
-            if call.timeout_ms_override is not None
-            else args.get("timeout_ms", DEFAULT_CALL_TIMEOUT_MS)
-        )
-        args["timeout_ms"] = min(timeout_target, DEFAULT_CALL_TIMEOUT_MS)
-        output_target = (
-            call.max_output_bytes_override
-            if call.max_output_bytes_override is not None
-            else args.get("max_output_bytes", DEFAULT_CALL_OUTPUT_BYTES)
-        )
-        args["max_output_bytes"] = min(output_target, DEFAULT_CALL_OUTPUT_BYTES)
-        return call.model_copy(update={"args": args})
+        return apply_call_clamps(call)
 
     def validate_step(self, step: Step) -> None:
         if not step.tool_calls:
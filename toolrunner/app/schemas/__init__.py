@@ -38,9 +38,15 @@ def _format_error(error: ValidationError) -> str:
     return f"{path}: {error.message}"
 
 
-def _validate(schema_name: str, data: Any) -> None:
+@cache
+def _validator(schema_name: str) -> Draft202012Validator:
     schema = _load_schema(schema_name)
-    validator = Draft202012Validator(schema)
+    Draft202012Validator.check_schema(schema)
+    return Draft202012Validator(schema)
+
+
+def _validate(schema_name: str, data: Any) -> None:
+    validator = _validator(schema_name)
     errors = sorted(validator.iter_errors(data), key=lambda err: tuple(err.path))
     if errors:
         raise SchemaValidationError(schema_name, [_format_error(err) for err in errors])
@@ -0,0 +1,71 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from toolrunner.app.main import app
+from toolrunner.app.tools import git_log, git_push, git_status, lint_runner
+
+from .helpers import Captured
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session, so app startup runs only once."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def seeded_run(client) -> str:
+    """A run with no locked SRS sections, shared by tests that leave its SRS untouched.
+
+    Runs are registered in the app's in-memory run manager, so the run is created
+    through the API once rather than copied from a template directory.
+    """
+    response = client.post("/v1/runs", json={"slug": "seeded"})
+    return response.json()["run_id"]
+
+
+@pytest.fixture(scope="session")
+def fake_workspace(tmp_path_factory) -> Path:
+    """Shared run directory for tool tests whose fakes never touch the filesystem."""
+    return tmp_path_factory.mktemp("ws")
+
+
+@pytest.fixture(scope="session")
+def agentmaestro_skeleton(tmp_path_factory) -> Path:
+    """Empty ``.agentmaestro`` plans/runs layout built once per session.
+
+    ``tmp_path_factory`` hands each pytest-xdist worker its own base directory, and
+    tests only ever copy the skeleton, so it is safe to share across workers.
+    """
+    root = tmp_path_factory.mktemp("skeleton")
+    (root / ".agentmaestro" / "plans").mkdir(parents=True)
+    (root / ".agentmaestro" / "runs").mkdir()
+    return root
+
+
+@pytest.fixture
+def agent_workspace(tmp_path: Path, agentmaestro_skeleton: Path) -> Path:
+    shutil.copytree(agentmaestro_skeleton, tmp_path, dirs_exist_ok=True)
+    return tmp_path
+
+
+@pytest.fixture
+def patched_run_command(monkeypatch):
+    """Route ``run_command`` in the git log/push/status and lint tools to a fake.
+
+    Tests set ``holder.response`` and inspect ``holder.captured``.
+    """
+    holder = SimpleNamespace(response=None, captured=Captured())
+
+    def fake_run_command(run_dir, run_args):
+        holder.captured.record(run_args)
+        return holder.response
+
+    for module in (git_log, git_push, git_status, lint_runner):
+        monkeypatch.setattr(module, "run_command", fake_run_command)
+    return holder
@@ -0,0 +1,192 @@
+import json
+from dataclasses import dataclass
+from functools import cache, lru_cache
+
+# JSONResponse renders compactly, so error envelopes can be matched on raw bytes.
+NOT_OK_PREFIX = b'{"ok":false,'
+PATH_ESCAPE_CODE = b'"code":"tool_runner.PATH_OUTSIDE_WORKSPACE"'
+
+
+@dataclass(frozen=True, slots=True)
+class FakeResponse:
+    """Stand-in for the JSONResponse ``run_command`` returns; tools only read ``body``."""
+
+    body: bytes
+    status_code: int = 200
+
+
+def _render(status_code: int, content: dict) -> FakeResponse:
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return FakeResponse(body=body, status_code=status_code)
+
+
+@dataclass(slots=True)
+class Captured:
+    """RunCommandArgs fields recorded by a fake ``run_command``."""
+
+    cmd: list[str] | None = None
+    cwd: str | None = None
+    timeout_ms: int | None = None
+    max_output_bytes: int | None = None
+
+    def record(self, run_args) -> None:
+        self.cmd = run_args.cmd
+        self.cwd = run_args.cwd
+        self.timeout_ms = run_args.timeout_ms
+        self.max_output_bytes = run_args.max_output_bytes
+
+
+def response_payload(response) -> dict:
+    return json.loads(response.body)
+
+
+@cache
+def command_response(
+    stdout: str = "",
+    stderr: str = "",
+    exit_code: int = 0,
+    stdout_truncated: bool = False,
+    stderr_truncated: bool = False,
+    duration_ms: int = 1,
+) -> FakeResponse:
+    """Build the envelope ``run_command`` returns so fakes can stand in for it.
+
+    Identical envelopes are rendered once and shared.
+    """
+    return _render(
+        200,
+        {
+            "ok": True,
+            "result": {
+                "exit_code": exit_code,
+                "duration_ms": duration_ms,
+                "timed_out": False,
+                "stdout": stdout,
+                "stderr": stderr,
+                "stdout_truncated": stdout_truncated,
+                "stderr_truncated": stderr_truncated,
+            },
+        },
+    )
+
+
+def command_payload(**kwargs) -> tuple[int, dict]:
+    """``command_response`` as the ``(status_code, envelope)`` pair of ``run_command_payload``."""
+    response = command_response(**kwargs)
+    return response.status_code, json.loads(response.body)
+
+
+@cache
+def error_response(message: str = "oops", code: str = "INVALID_ARGUMENT") -> FakeResponse:
+    return _render(
+        400,
+        {
+            "ok": False,
+            "error": {
+                "code": f"tool_runner.{code}",
+                "message": message,
+                "details": {},
+            },
+        },
+    )
+
+
+def make_fake_run_command(response, captured: Captured | None = None):
+    """Return a ``run_command`` stand-in that records its args and replies with ``response``."""
+
+    def fake_run_command(run_dir, run_args):
+        if captured is not None:
+            captured.record(run_args)
+        return response
+
+    return fake_run_command
+
+
+def charter_payload(
+    *,
+    run_id: str,
+    slug: str,
+    allowed_tools: dict[str, list[str]] | None = None,
+    stop_conditions: dict[str, int] | None = None,
+    require_approval_for: list[str] | None = None,
+) -> dict:
+    """Build a schema-valid run charter for the orchestrator tests."""
+    return {
+        "schema_version": "1.0",
+        "run_id": run_id,
+        "slug": slug,
+        "created_at": "2026-01-01T00:00:00Z",
+        "repo_dir": ".",
+        "srs": {"path": "srs.md", "sha256": "a" * 64},
+        "models": {
+            "maestro": {"name": "maestro"},
+            "apprentice": {"name": "apprentice"},
+        },
+        "allowed_tools": allowed_tools
+        or {
+            "tier1": ["format_runner", "run_command"],
+            "tier2": [],
+            "git": ["git_status"],
+        },
+        "quality_gates": {
+            "default": [
+                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
+            ],
+            "on_merge_candidate": [
+                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
+            ],
+        },
+        "branch_strategy": {
+            "type": "feature_branch",
+            "name_template": "agent/{run_id}/{slug}",
+            "base_branch": "main",
+        },
+        "stop_conditions": stop_conditions
+        or {"max_cycles": 10, "max_failures": 1, "max_minutes": 60},
+        "policies": {
+            "require_approval_for": require_approval_for or [],
+            "prohibit_outside_workspace": True,
+            "prefer_revert_over_reset": True,
+            "secrets_handling": "redact",
+        },
+    }
+
+
+@lru_cache(maxsize=64)
+def _encode_charter(
+    run_id: str,
+    slug: str,
+    allowed_tools_key: tuple | None,
+    stop_conditions_key: tuple | None,
+    approval_key: tuple[str, ...] | None,
+) -> bytes:
+    payload = charter_payload(
+        run_id=run_id,
+        slug=slug,
+        allowed_tools={tier: list(tools) for tier, tools in allowed_tools_key}
+        if allowed_tools_key
+        else None,
+        stop_conditions=dict(stop_conditions_key) if stop_conditions_key else None,
+        require_approval_for=list(approval_key) if approval_key else None,
+    )
+    return json.dumps(payload).encode("utf-8")
+
+
+def charter_bytes(
+    *,
+    run_id: str,
+    slug: str,
+    allowed_tools: dict[str, list[str]] | None = None,
+    stop_conditions: dict[str, int] | None = None,
+    require_approval_for: list[str] | None = None,
+) -> bytes:
+    """Serialized ``charter_payload``; identical overrides are encoded once and shared."""
+    return _encode_charter(
+        run_id,
+        slug,
+        tuple(sorted((tier, tuple(tools)) for tier, tools in allowed_tools.items()))
+        if allowed_tools
+        else None,
+        tuple(sorted(stop_conditions.items())) if stop_conditions else None,
+        tuple(require_approval_for) if require_approval_for else None,
+    )
@@ -1,15 +1,10 @@
-import hmac
 import hashlib
+import hmac
 import json
 import time
 
-from fastapi.testclient import TestClient
-
-from toolrunner.app import app
 from toolrunner.app.config import SECRET, TIMESTAMP_SKEW_SECONDS
 
-client = TestClient(app)
-
 
 def signer(body: bytes, timestamp: str | None = None) -> tuple[str, str]:
     ts = timestamp or str(int(time.time()))
@@ -29,7 +24,7 @@ def _fixture_payload():
     }
 
 
-def test_missing_signature():
+def test_missing_signature(client):
     payload = json.dumps(_fixture_payload()).encode("utf-8")
     timestamp, _ = signer(payload)
     response = client.post(
@@ -40,7 +35,7 @@ def test_missing_signature():
     assert response.status_code == 401
 
 
-def test_invalid_signature():
+def test_invalid_signature(client):
     payload = json.dumps(_fixture_payload()).encode("utf-8")
     timestamp, _ = signer(payload)
     response = client.post(
@@ -51,7 +46,7 @@ def test_invalid_signature():
     assert response.status_code == 401
 
 
-def test_valid_signature():
+def test_valid_signature(client):
     payload = json.dumps(_fixture_payload()).encode("utf-8")
     timestamp, signature = signer(payload)
     response = client.post(
@@ -70,7 +65,7 @@ def test_valid_signature():
     assert "stdout" in body
 
 
-def test_stale_timestamp_rejected():
+def test_stale_timestamp_rejected(client):
     payload = json.dumps(_fixture_payload()).encode("utf-8")
     stale_timestamp = str(int(time.time()) - TIMESTAMP_SKEW_SECONDS - 5)
     timestamp, signature = signer(payload, timestamp=stale_timestamp)
@@ -3,18 +3,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from fastapi.testclient import TestClient
-
-from toolrunner.app.main import app
-
-client = TestClient(app)
-
 
 def _run_root(run_id: str) -> Path:
     return Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs" / run_id
 
 
-def test_chat_endpoints_persist_transcript_and_history():
+def test_chat_endpoints_persist_transcript_and_history(client):
     response = client.post("/v1/runs", json={"slug": "chat-endpoint"})
     run_id = response.json().get("run_id")
     assert run_id
@@ -38,7 +32,7 @@ def test_chat_endpoints_persist_transcript_and_history():
     assert len(paged.json()["messages"]) == 2
 
 
-def test_chat_applies_srs_updates():
+def test_chat_applies_srs_updates(client):
     response = client.post("/v1/runs", json={"slug": "chat-srs"})
     run_id = response.json().get("run_id")
     assert run_id
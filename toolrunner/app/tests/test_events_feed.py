@@ -1,11 +1,4 @@
-from fastapi.testclient import TestClient
-
-from toolrunner.app.main import app
-
-client = TestClient(app)
-
-
-def test_events_feed_returns_prompt_event():
+def test_events_feed_returns_prompt_event(client):
     create = client.post("/v1/runs", json={"slug": "events-test"})
     run_id = create.json()["run_id"]
     sections = client.get(f"/v1/runs/{run_id}/srs/sections").json()
@@ -1,9 +1,9 @@
 import base64
-import json
 import hashlib
-
+import json
 from pathlib import Path
 
+import pytest
 from fastapi.responses import JSONResponse
 
 from toolrunner.app.models import FilePatchArgs
@@ -28,6 +28,21 @@ PATCH_FAIL = """--- a/target.txt
 +added
 """
 
+PATCH_MULTI_FILE = """diff --git a/other.txt b/other.txt
+--- a/other.txt
++++ b/other.txt
+@@ -1 +1 @@
+-other
++changed
+diff --git a/target.txt b/target.txt
+--- a/target.txt
++++ b/target.txt
+@@ -1,2 +1,2 @@
+ keep
+-old
++new
+"""
+
 
 def test_file_patch_success(tmp_path: Path):
     path = tmp_path / "target.txt"
@@ -62,6 +77,52 @@ def test_file_patch_partial(tmp_path: Path):
     assert payload["result"]["rejects_path"]
 
 
+def test_file_patch_applies_only_requested_file(tmp_path: Path):
+    path = tmp_path / "target.txt"
+    path.write_text("keep\nold\n")
+    args = FilePatchArgs(path="target.txt", patch_unified=PATCH_MULTI_FILE)
+    response = apply_patch(tmp_path, args)
+    payload = _json_response(response)
+    assert payload["ok"]
+    assert payload["result"]["hunks_total"] == 1
+    assert path.read_text() == "keep\nnew\n"
+
+
+def test_file_patch_rejects_truncated_hunk(tmp_path: Path):
+    path = tmp_path / "target.txt"
+    path.write_text("old\n")
+    truncated = PATCH.replace("+new\n", "")
+    args = FilePatchArgs(path="target.txt", patch_unified=truncated)
+    response = apply_patch(tmp_path, args)
+    payload = _json_response(response)
+    assert not payload["ok"]
+    assert payload["error"]["code"].endswith("PATCH_FAILED")
+    assert path.read_text() == "old\n"
+
+
+_CRLF_HUNK = "@@ -1,3 +1,3 @@\r\n keep\r\n-old\r\n+new\r\n tail\r\n"
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        "diff --git a/target.txt b/target.txt\r\n--- a/target.txt\r\n+++ b/target.txt\r\n"
+        + _CRLF_HUNK,
+        _CRLF_HUNK,
+        "@@ -1,3 +1,3 @@\n keep\n-old\n+new\n tail\n",
+    ],
+    ids=["crlf_patch", "crlf_patch_without_headers", "lf_patch"],
+)
+def test_file_patch_preserves_crlf_line_endings(tmp_path: Path, patch: str):
+    path = tmp_path / "target.txt"
+    path.write_bytes(b"keep\r\nold\r\ntail\r\n")
+    args = FilePatchArgs(path="target.txt", patch_unified=patch)
+    response = apply_patch(tmp_path, args)
+    payload = _json_response(response)
+    assert payload["ok"]
+    assert path.read_bytes() == b"keep\r\nnew\r\ntail\r\n"
+
+
 def _sha(path: Path) -> str:
     hasher = hashlib.sha256()
     hasher.update(path.read_bytes())
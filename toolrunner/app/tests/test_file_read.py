@@ -4,6 +4,7 @@ from pathlib import Path
 from fastapi.responses import JSONResponse
 
 from toolrunner.app.models import FileReadArgs
+from toolrunner.app.tools import file_read as file_read_module
 from toolrunner.app.tools.file_read import read_file
 
 
@@ -53,3 +54,25 @@ def test_file_read_directory(tmp_path: Path):
     response = read_file(tmp_path, args)
     payload = json.loads(response.body)
     assert payload["error"]["code"].endswith("IS_DIRECTORY")
+
+
+def test_file_read_text_truncates_on_raw_bytes(tmp_path: Path):
+    file = tmp_path / "crlf.txt"
+    file.write_bytes(b"one\r\ntwo\rthree\nfour")
+    args = FileReadArgs(path="crlf.txt", mode="text", max_bytes=9)
+    response = read_file(tmp_path, args)
+    payload = json.loads(response.body)
+    assert payload["ok"] is True
+    assert payload["result"]["content"] == "one\ntwo\n"
+    assert payload["result"]["truncated"] is True
+    assert payload["result"]["total_lines"] == 4
+
+
+def test_file_read_text_splits_cr_at_block_boundary(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(file_read_module, "READ_BLOCK_SIZE", 4)
+    file = tmp_path / "cr.txt"
+    file.write_bytes(b"aaa\rtail")
+    args = FileReadArgs(path="cr.txt", mode="text")
+    payload = json.loads(read_file(tmp_path, args).body)
+    assert payload["result"]["content"] == "aaa\ntail"
+    assert payload["result"]["total_lines"] == 2
@@ -1,7 +1,6 @@
 import base64
 import hashlib
 import json
-
 from pathlib import Path
 
 from fastapi.responses import JSONResponse
@@ -73,3 +72,23 @@ def test_file_write_make_dirs_false(tmp_path: Path):
     response = write_file(tmp_path, args)
     payload = _json_response(response)
     assert payload["error"]["code"].endswith("INVALID_ARGUMENT")
+
+
+def test_file_write_atomic_overwrite_keeps_mode(tmp_path: Path):
+    target = tmp_path / "script.sh"
+    target.write_text("old")
+    target.chmod(0o755)
+    args = FileWriteArgs(path="script.sh", content="new", overwrite=True)
+    payload = _json_response(write_file(tmp_path, args))
+    assert payload["ok"]
+    assert target.read_text() == "new"
+    assert target.stat().st_mode & 0o777 == 0o755
+    assert [path.name for path in tmp_path.iterdir()] == ["script.sh"]
+
+
+def test_file_write_atomic_long_name(tmp_path: Path):
+    name = "n" * 250 + ".txt"
+    args = FileWriteArgs(path=name, content="data")
+    payload = _json_response(write_file(tmp_path, args))
+    assert payload["ok"]
+    assert (tmp_path / name).read_text() == "data"
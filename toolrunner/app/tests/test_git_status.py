@@ -1,50 +1,12 @@
-import json
 from pathlib import Path
 
-from fastapi.responses import JSONResponse
-
-from toolrunner.app.models import GitStatusArgs, RunCommandArgs
-from toolrunner.app.tools import git_status as git_status_module
+from toolrunner.app.models import GitStatusArgs
 from toolrunner.app.tools.git_status import run_git_status
 
-
-def _payload(response):
-    return json.loads(response.body.decode("utf-8"))
-
-
-def _fake_success_response(stdout: str = "", stderr: str = ""):
-    return JSONResponse(
-        status_code=200,
-        content={
-            "ok": True,
-            "result": {
-                "exit_code": 0,
-                "duration_ms": 1,
-                "timed_out": False,
-                "stdout": stdout,
-                "stderr": stderr,
-                "stdout_truncated": False,
-                "stderr_truncated": False,
-            },
-        },
-    )
-
-
-def _fake_error_response(message: str, code: str = "NOT_FOUND"):
-    return JSONResponse(
-        status_code=400,
-        content={
-            "ok": False,
-            "error": {
-                "code": f"tool_runner.{code}",
-                "message": message,
-                "details": {},
-            },
-        },
-    )
+from .helpers import command_response, error_response, response_payload
 
 
-def test_git_status_parses_branches_and_paths(monkeypatch, tmp_path: Path):
+def test_git_status_parses_branches_and_paths(patched_run_command, tmp_path: Path):
     sample_output = """# branch.oid abcdef123
 # branch.head feature
 # branch.upstream origin/feature
@@ -56,20 +18,10 @@ def test_git_status_parses_branches_and_paths(monkeypatch, tmp_path: Path):
 u UU N... 100644 100644 100644 mno mno conflict.txt
 ? new file.txt
 """
-    captured: dict[str, object] = {}
-
-    def fake_run_command(run_dir, run_args):
-        captured["run_dir"] = run_dir
-        captured["cmd"] = run_args.cmd
-        captured["cwd"] = run_args.cwd
-        captured["timeout_ms"] = run_args.timeout_ms
-        captured["max_output_bytes"] = run_args.max_output_bytes
-        return _fake_success_response(stdout=sample_output)
-
-    monkeypatch.setattr(git_status_module, "run_command", fake_run_command)
+    patched_run_command.response = command_response(stdout=sample_output)
     args = GitStatusArgs()
     response = run_git_status(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
 
     assert payload["ok"]
     result = payload["result"]
@@ -89,35 +41,26 @@ u UU N... 100644 100644 100644 mno mno conflict.txt
     assert not result["is_clean"]
     assert result["raw"]["stdout"] == sample_output.replace("\r\n", "\n")
     assert result["raw"]["stderr"] == ""
-    assert captured["cmd"] == ["git", "status", "--porcelain=v2", "--branch"]
-    assert captured["cwd"] == "."
-
+    assert patched_run_command.captured.cmd == ["git", "status", "--porcelain=v2", "--branch"]
+    assert patched_run_command.captured.cwd == "."
 
-def test_git_status_respects_include_untracked_flag(monkeypatch, tmp_path: Path):
-    captured: dict[str, object] = {}
 
-    def fake_run_command(run_dir, run_args):
-        captured["cmd"] = run_args.cmd
-        return _fake_success_response()
-
-    monkeypatch.setattr(git_status_module, "run_command", fake_run_command)
+def test_git_status_respects_include_untracked_flag(patched_run_command, tmp_path: Path):
+    patched_run_command.response = command_response()
     args = GitStatusArgs(include_untracked=False)
     response = run_git_status(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
 
     assert payload["ok"]
     assert payload["result"]["untracked"] == []
-    assert "--untracked-files=no" in captured["cmd"]
-
+    assert "--untracked-files=no" in patched_run_command.captured.cmd
 
-def test_git_status_not_git_repo(monkeypatch, tmp_path: Path):
-    def fake_run_command(run_dir, run_args):
-        return _fake_error_response("not a git repository", code="NOT_FOUND")
 
-    monkeypatch.setattr(git_status_module, "run_command", fake_run_command)
+def test_git_status_not_git_repo(patched_run_command, tmp_path: Path):
+    patched_run_command.response = error_response("not a git repository", code="NOT_FOUND")
     args = GitStatusArgs()
     response = run_git_status(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
 
     assert not payload["ok"]
     assert payload["error"]["code"].endswith("NOT_FOUND")
@@ -0,0 +1,514 @@
+from pathlib import Path
+
+import pytest
+
+from toolrunner.app.models import (
+    GitAddArgs,
+    GitApplyArgs,
+    GitBranchCreateArgs,
+    GitCheckoutArgs,
+    GitCommitArgs,
+    GitDiffArgs,
+)
+from toolrunner.app.tools import git_add as git_add_module
+from toolrunner.app.tools import git_apply as git_apply_module
+from toolrunner.app.tools import git_branch_create as branch_module
+from toolrunner.app.tools import git_checkout as git_checkout_module
+from toolrunner.app.tools import git_commit as git_commit_module
+from toolrunner.app.tools import git_diff as git_diff_module
+from toolrunner.app.tools.git_add import run_git_add
+from toolrunner.app.tools.git_apply import run_git_apply
+from toolrunner.app.tools.git_branch_create import run_git_branch_create
+from toolrunner.app.tools.git_checkout import run_git_checkout
+from toolrunner.app.tools.git_commit import run_git_commit
+from toolrunner.app.tools.git_diff import run_git_diff
+
+from .helpers import (
+    NOT_OK_PREFIX,
+    PATH_ESCAPE_CODE,
+    Captured,
+    command_payload,
+    command_response,
+    error_response,
+    make_fake_run_command,
+    response_payload,
+)
+
+_REJECT_APPLY_ARGS = GitApplyArgs.model_construct(patch_unified="diff", reject=True)
+_CHECKOUT_MAIN_ARGS = GitCheckoutArgs.model_construct(ref="main")
+_COMMIT_ARGS = GitCommitArgs.model_construct(
+    message="Fix it", paths_to_add=["toolrunner/app/file_patch.py"]
+)
+_DIFF_ARGS = GitDiffArgs.model_construct(
+    paths=["toolrunner/app/file_patch.py"], context_lines=5, detect_renames=True
+)
+
+TOOLS = (
+    pytest.param(
+        git_add_module,
+        "run_command_payload",
+        run_git_add,
+        GitAddArgs.model_construct(paths=["../outside"]),
+        id="add",
+    ),
+    pytest.param(
+        git_apply_module,
+        "run_command_payload",
+        run_git_apply,
+        GitApplyArgs.model_construct(repo_dir="../outside", patch_unified="diff"),
+        id="apply",
+    ),
+    pytest.param(
+        branch_module,
+        "run_command",
+        run_git_branch_create,
+        GitBranchCreateArgs.model_construct(repo_dir="../outside", name="x"),
+        id="branch_create",
+    ),
+    pytest.param(
+        git_checkout_module,
+        "run_command",
+        run_git_checkout,
+        GitCheckoutArgs.model_construct(repo_dir="../outside", ref="main"),
+        id="checkout",
+    ),
+    pytest.param(
+        git_commit_module,
+        "run_command",
+        run_git_commit,
+        GitCommitArgs.model_construct(message="Escape", paths_to_add=["../outside/file"]),
+        id="commit",
+    ),
+    pytest.param(
+        git_diff_module,
+        "run_command",
+        run_git_diff,
+        GitDiffArgs.model_construct(paths=["../outside"]),
+        id="diff",
+    ),
+)
+
+
+@pytest.mark.parametrize("tool_module, runner, run_tool, args", TOOLS)
+def test_git_tool_path_escape(
+    monkeypatch, fake_workspace: Path, tool_module, runner, run_tool, args
+):
+    called = False
+
+    def fake_run_command(run_dir, run_args):
+        nonlocal called
+        called = True
+        return command_response()
+
+    monkeypatch.setattr(tool_module, runner, fake_run_command)
+    response = run_tool(fake_workspace, args)
+    assert response.body.startswith(NOT_OK_PREFIX)
+    assert PATH_ESCAPE_CODE in response.body
+    assert not called
+
+
+# git add
+
+
+def test_git_add_paths(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        return command_payload(stdout="ok")
+
+    monkeypatch.setattr(git_add_module, "run_command_payload", fake_run_command)
+    args = GitAddArgs.model_construct(
+        paths=["toolrunner/app/file_patch.py", "toolrunner/app/file_read.py"]
+    )
+    response = run_git_add(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert commands[0][:2] == ["git", "add"]
+    assert "--" in commands[0]
+    assert payload["result"]["staged_paths"] == ["toolrunner/app/file_patch.py", "toolrunner/app/file_read.py"]
+    assert payload["result"]["raw"]["stdout"] == "ok"
+
+
+def test_git_add_all(monkeypatch, fake_workspace: Path):
+    monkeypatch.setattr(
+        git_add_module, "run_command_payload", lambda run_dir, run_args: command_payload(stdout="ok")
+    )
+    args = GitAddArgs.model_construct(all=True)
+    response = run_git_add(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert payload["result"]["staged_paths"] == []
+    assert payload["result"]["raw"]["stdout"] == "ok"
+
+
+def test_git_add_intent_to_add(monkeypatch, fake_workspace: Path):
+    captured: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        captured.append(run_args.cmd)
+        return command_payload(stdout="ok")
+
+    monkeypatch.setattr(git_add_module, "run_command_payload", fake_run_command)
+    args = GitAddArgs.model_construct(intent_to_add=True, paths=["toolrunner/app/file_patch.py"])
+    response = run_git_add(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert "-N" in captured[0]
+
+
+def test_git_add_invalid_all_with_paths():
+    with pytest.raises(Exception) as excinfo:
+        GitAddArgs(all=True, paths=["toolrunner/app/file_patch.py"])
+    assert "all=True cannot be combined" in str(excinfo.value)
+
+
+def test_git_add_intent_requires_paths():
+    with pytest.raises(Exception) as excinfo:
+        GitAddArgs(intent_to_add=True)
+    assert "intent_to_add requires paths" in str(excinfo.value)
+
+
+# git apply
+
+
+def test_git_apply_success(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        return command_payload(stdout="applied")
+
+    monkeypatch.setattr(git_apply_module, "run_command_payload", fake_run_command)
+    args = GitApplyArgs.model_construct(patch_unified="diff", strip_prefix=2)
+    response = run_git_apply(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert commands[0][:3] == ["git", "apply", "-p2"]
+    assert "--reject" in commands[0]
+    result = payload["result"]
+    assert result["applied"]
+    assert result["rejects_created"] is False
+    assert result["reject_paths"] == []
+    assert result["repo_dir"] == "."
+    assert result["strip_prefix"] == 2
+
+
+def test_git_apply_check_mode(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        return command_payload(stdout="check")
+
+    monkeypatch.setattr(git_apply_module, "run_command_payload", fake_run_command)
+    args = GitApplyArgs.model_construct(patch_unified="diff", check=True, reject=False)
+    response = run_git_apply(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    result = payload["result"]
+    assert "--check" in commands[0]
+    assert result["applied"] is False
+    assert result["check_passed"]
+    assert result["rejects_created"] is False
+    assert result["reject_paths"] == []
+
+
+def test_git_apply_reject_created(monkeypatch, tmp_path: Path):
+    def fake_run_command(run_dir, run_args):
+        (run_dir / "patch.rej").write_text("reject")
+        return command_payload(stderr="reject", exit_code=1)
+
+    monkeypatch.setattr(git_apply_module, "run_command_payload", fake_run_command)
+    response = run_git_apply(tmp_path, _REJECT_APPLY_ARGS)
+    payload = response_payload(response)
+    result = payload["result"]
+    assert payload["ok"]
+    assert result["rejects_created"] is True
+    assert result["reject_paths"] == ["patch.rej"]
+
+
+def test_git_apply_reject_lists_only_new_nested_files(monkeypatch, tmp_path: Path):
+    (tmp_path / "old.rej").write_text("stale")
+    (tmp_path / ".git").mkdir()
+
+    def fake_run_command(run_dir, run_args):
+        nested = run_dir / "pkg" / "sub"
+        nested.mkdir(parents=True)
+        (nested / "mod.py.rej").write_text("reject")
+        (run_dir / ".git" / "ignored.rej").write_text("reject")
+        return command_payload(stderr="reject", exit_code=1)
+
+    monkeypatch.setattr(git_apply_module, "run_command_payload", fake_run_command)
+    response = run_git_apply(tmp_path, _REJECT_APPLY_ARGS)
+    result = response_payload(response)["result"]
+    assert result["reject_paths"] == ["pkg/sub/mod.py.rej"]
+
+
+def test_git_apply_reject_without_files(monkeypatch, fake_workspace: Path):
+    monkeypatch.setattr(
+        git_apply_module,
+        "run_command_payload",
+        lambda run_dir, run_args: command_payload(stderr="reject", exit_code=1),
+    )
+    response = run_git_apply(fake_workspace, _REJECT_APPLY_ARGS)
+    payload = response_payload(response)
+    result = payload["result"]
+    assert payload["ok"]
+    assert result["rejects_created"] is False
+    assert result["reject_paths"] == []
+
+
+# git branch create
+
+
+def test_git_branch_create(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        return command_response(stdout="ok")
+
+    monkeypatch.setattr(branch_module, "run_command", fake_run_command)
+    args = GitBranchCreateArgs.model_construct(name="agent/branch", checkout=True, force=True)
+    response = run_git_branch_create(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert commands[0][:3] == ["git", "branch", "-f"]
+    assert commands[0][-1] == "HEAD"
+    assert commands[1][:4] == ["git", "switch", "--", "agent/branch"]
+    result = payload["result"]
+    assert result["checked_out"]
+    assert result["repo_dir"] == "."
+
+
+def test_git_branch_create_no_checkout(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        return command_response(stdout="ok")
+
+    monkeypatch.setattr(branch_module, "run_command", fake_run_command)
+    args = GitBranchCreateArgs.model_construct(name="test", checkout=False)
+    response = run_git_branch_create(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert len(commands) == 1
+    assert payload["result"]["checked_out"] is False
+
+
+# git checkout
+
+
+def test_git_checkout_switch_branch(monkeypatch, fake_workspace):
+    captured = Captured()
+    fake_run_command = make_fake_run_command(
+        command_response(stdout="Switched to branch 'main'\n"), captured
+    )
+    monkeypatch.setattr(git_checkout_module, "run_command", fake_run_command)
+    args = _CHECKOUT_MAIN_ARGS
+    response = run_git_checkout(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert payload["ok"]
+    assert payload["result"]["ref"] == "main"
+    assert not payload["result"]["detached"]
+    assert payload["result"]["repo_dir"] == "."
+    assert ["git", "checkout", "--", "main"] == captured.cmd
+    assert captured.cwd == "."
+    assert captured.max_output_bytes == args.max_output_bytes
+
+
+def test_git_checkout_create_branch(monkeypatch, fake_workspace):
+    captured = Captured()
+
+    def fake_run_command(run_dir, run_args):
+        captured.cmd = run_args.cmd
+        return command_response(stdout="Switched to a new branch 'feature'\n")
+
+    monkeypatch.setattr(git_checkout_module, "run_command", fake_run_command)
+    args = GitCheckoutArgs.model_construct(ref="feature", create=True)
+    response = run_git_checkout(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert payload["ok"]
+    assert payload["result"]["detached"] is False
+    assert captured.cmd == ["git", "checkout", "-b", "feature"]
+
+
+def test_git_checkout_detached(monkeypatch, fake_workspace):
+    def fake_run_command(run_dir, run_args):
+        return command_response(
+            stdout="Note: switching to 'deadbeef'\nYou are in 'detached HEAD' state.\n"
+        )
+
+    monkeypatch.setattr(git_checkout_module, "run_command", fake_run_command)
+    args = GitCheckoutArgs.model_construct(ref="deadbeef")
+    response = run_git_checkout(fake_workspace, args)
+    payload = response_payload(response)
+    assert payload["ok"]
+    assert payload["result"]["detached"]
+
+
+def test_git_checkout_propagates_errors(monkeypatch, fake_workspace):
+    monkeypatch.setattr(
+        git_checkout_module, "run_command", lambda run_dir, run_args: error_response()
+    )
+    args = _CHECKOUT_MAIN_ARGS
+    response = run_git_checkout(fake_workspace, args)
+    payload = response_payload(response)
+    assert not payload["ok"]
+    assert payload["error"]["code"].endswith("INVALID_ARGUMENT")
+
+
+# git commit
+
+
+def test_git_commit_stages_paths_and_commits(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        cmd = run_args.cmd
+        if cmd[:3] == ["git", "add", "--"]:
+            return command_response()
+        if cmd == ["git", "commit", "-m", "Fix it"]:
+            return command_response(stdout="[main 1234abc] Fix it\n")
+        if cmd == ["git", "rev-parse", "HEAD"]:
+            return command_response(stdout="1234abc\n")
+        if cmd[:2] == ["git", "diff-tree"]:
+            return command_response(stdout="toolrunner/app/file_patch.py\n")
+        return command_response()
+
+    monkeypatch.setattr(git_commit_module, "run_command", fake_run_command)
+    response = run_git_commit(fake_workspace, _COMMIT_ARGS)
+    payload = response_payload(response)
+
+    assert payload["ok"]
+    assert payload["result"]["commit_oid"] == "1234abc"
+    assert payload["result"]["summary"] == "Fix it"
+    assert payload["result"]["changed_files"] == 1
+    assert payload["result"]["repo_dir"] == "."
+    assert commands[0] == ["git", "add", "--", "toolrunner/app/file_patch.py"]
+    assert ["git", "commit", "-m", "Fix it"] in commands
+
+
+def test_git_commit_add_all_signoff_amend(monkeypatch, fake_workspace: Path):
+    commands: list[list[str]] = []
+
+    def fake_run_command(run_dir, run_args):
+        commands.append(run_args.cmd)
+        cmd = run_args.cmd
+        if cmd == ["git", "add", "-A"]:
+            return command_response()
+        if cmd[:3] == ["git", "commit", "-m"]:
+            return command_response(stdout="[main 1234] updated\n")
+        if cmd == ["git", "rev-parse", "HEAD"]:
+            return command_response(stdout="abcd\n")
+        if cmd[:2] == ["git", "diff-tree"]:
+            return command_response(stdout="file1.py\nfile2.py\n")
+        return command_response()
+
+    monkeypatch.setattr(git_commit_module, "run_command", fake_run_command)
+    args = GitCommitArgs.model_construct(
+        message="Update",
+        add_all=True,
+        signoff=True,
+        amend=True,
+    )
+    response = run_git_commit(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert payload["ok"]
+    assert payload["result"]["changed_files"] == 2
+    commit_cmds = [cmd for cmd in commands if cmd and cmd[1] == "commit"]
+    assert commit_cmds
+    assert {"--signoff", "--amend"} <= set(commit_cmds[-1])
+    assert ["git", "add", "-A"] in commands
+
+
+def test_git_commit_nothing_to_commit(monkeypatch, fake_workspace: Path):
+    def fake_run_command(run_dir, run_args):
+        if run_args.cmd and run_args.cmd[1] == "commit":
+            return command_response(stdout="nothing to commit, working tree clean\n", exit_code=1)
+        return command_response()
+
+    monkeypatch.setattr(git_commit_module, "run_command", fake_run_command)
+    args = GitCommitArgs.model_construct(message="Nothing")
+    response = run_git_commit(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert not payload["ok"]
+    assert payload["error"]["code"].endswith("CONFLICT")
+    assert payload["error"]["message"] == "nothing to commit"
+
+
+def test_git_commit_propagates_add_error(monkeypatch, fake_workspace: Path):
+    monkeypatch.setattr(
+        git_commit_module, "run_command", lambda run_dir, run_args: error_response("bad add")
+    )
+    args = GitCommitArgs.model_construct(message="fail", paths_to_add=["file"])
+    response = run_git_commit(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert not payload["ok"]
+    assert payload["error"]["code"].endswith("INVALID_ARGUMENT")
+
+
+def test_git_commit_paths_and_add_all_invalid(fake_workspace: Path):
+    args = GitCommitArgs(message="Conflict", paths_to_add=["file"], add_all=True)
+    response = run_git_commit(fake_workspace, args)
+    payload = response_payload(response)
+
+    assert not payload["ok"]
+    assert payload["error"]["code"].endswith("INVALID_ARGUMENT")
+
+
+# git diff
+
+
+def test_git_diff_basic(monkeypatch, fake_workspace: Path):
+    captured = Captured()
+
+    def fake_run_command(run_dir, run_args):
+        captured.cmd = run_args.cmd
+        return command_response(stdout="diff --git a/b c/d\r\n", duration_ms=5)
+
+    monkeypatch.setattr(git_diff_module, "run_command", fake_run_command)
+    response = run_git_diff(fake_workspace, _DIFF_ARGS)
+    payload = response_payload(response)
+    assert payload["ok"]
+    result = payload["result"]
+    assert result["repo_dir"] == "."
+    assert result["paths"] == ["toolrunner/app/file_patch.py"]
+    assert result["diff"].endswith("\n")
+    assert {"--find-renames", "-U"} <= set(captured.cmd)
+    assert captured.cmd[-1] == "toolrunner/app/file_patch.py"
+
+
+def test_git_diff_staged(monkeypatch, fake_workspace: Path):
+    captured = Captured()
+
+    def fake_run_command(run_dir, run_args):
+        captured.cmd = run_args.cmd
+        return command_response(stdout="staged diff")
+
+    monkeypatch.setattr(git_diff_module, "run_command", fake_run_command)
+    args = GitDiffArgs.model_construct(staged=True)
+    response = run_git_diff(fake_workspace, args)
+    payload = response_payload(response)
+    result = payload["result"]
+    assert result["staged"]
+    assert "--cached" in captured.cmd
+
+
+def test_git_diff_truncated(monkeypatch, fake_workspace: Path):
+    monkeypatch.setattr(
+        git_diff_module,
+        "run_command",
+        lambda run_dir, run_args: command_response(stdout="diff", stdout_truncated=True),
+    )
+    response = run_git_diff(fake_workspace, GitDiffArgs.model_construct())
+    payload = response_payload(response)
+    assert payload["result"]["truncated"]
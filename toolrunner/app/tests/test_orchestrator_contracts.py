@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -7,77 +8,40 @@ from typing import Any, Dict, List, Optional
 import pytest
 
 from toolrunner.app.config import COMMAND_TIMEOUT, OUTPUT_LIMIT
-from toolrunner.app.orchestrator import Orchestrator, ToolCall, orchestrate
-from toolrunner.app.schemas import SchemaValidationError
+from toolrunner.app.orchestrator import ToolCall, apply_call_clamps, orchestrate
+from toolrunner.app.schemas import SchemaValidationError, validate_plan, validate_run_charter
+
+from .helpers import charter_bytes, charter_payload
 
 DEFAULT_RUN_ID = "run-contract"
 
+# Every test gets the shared .agentmaestro plans/runs skeleton copied into its tmp_path.
+pytestmark = pytest.mark.usefixtures("agent_workspace")
+
 
 class FakeToolInvoker:
+    __slots__ = ("responses", "calls")
+
     def __init__(self, responses: Dict[str, Dict[str, Any]] | None = None) -> None:
         self.responses = responses or {}
         self.calls: List[ToolCall] = []
 
     def invoke(self, call: ToolCall, charter: Any) -> Dict[str, Any]:
         self.calls.append(call)
-        return self.responses.get(
-            call.call_id,
-            {
-                "call_id": call.call_id,
-                "tool": call.tool,
-                "ok": True,
-                "result": {"args": call.args},
-            },
-        )
+        response = self.responses.get(call.call_id)
+        if response is not None:
+            return response
+        return {
+            "call_id": call.call_id,
+            "tool": call.tool,
+            "ok": True,
+            "result": {"args": call.args},
+        }
 
 
-def _charter_payload(
-    *,
-    run_id: str = DEFAULT_RUN_ID,
-    slug: str = "agent-slug",
-    allowed_tools: Optional[Dict[str, List[str]]] = None,
-    stop_conditions: Optional[Dict[str, int]] = None,
-    require_approval_for: Optional[List[str]] = None,
-) -> Dict[str, Any]:
-    return {
-        "schema_version": "1.0",
-        "run_id": run_id,
-        "slug": slug,
-        "created_at": "2026-01-01T00:00:00Z",
-        "repo_dir": ".",
-        "srs": {"path": "srs.md", "sha256": "a" * 64},
-        "models": {
-            "maestro": {"name": "maestro"},
-            "apprentice": {"name": "apprentice"},
-        },
-        "allowed_tools": allowed_tools
-        or {
-            "tier1": ["format_runner", "run_command"],
-            "tier2": [],
-            "git": ["git_status"],
-        },
-        "quality_gates": {
-            "default": [
-                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
-            ],
-            "on_merge_candidate": [
-                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
-            ],
-        },
-        "branch_strategy": {
-            "type": "feature_branch",
-            "name_template": "agent/{run_id}/{slug}",
-            "base_branch": "main",
-        },
-        "stop_conditions": stop_conditions
-        or {"max_cycles": 10, "max_failures": 2, "max_minutes": 60},
-        "policies": {
-            "require_approval_for": require_approval_for or [],
-            "prohibit_outside_workspace": True,
-            "prefer_revert_over_reset": True,
-            "secrets_handling": "redact",
-        },
-    }
+@pytest.fixture(scope="session")
+def base_charter_payload() -> Dict[str, Any]:
+    return charter_payload(run_id=DEFAULT_RUN_ID, slug="agent-slug")
 
 
 def _write_charter(
@@ -87,18 +51,15 @@ def _write_charter(
     stop_conditions: Optional[Dict[str, int]] = None,
     require_approval_for: Optional[List[str]] = None,
 ) -> Path:
-    agent_root = tmp_path / ".agentmaestro"
-    agent_root.mkdir(parents=True, exist_ok=True)
-    (agent_root / "plans").mkdir(parents=True, exist_ok=True)
-    charter_path = agent_root / "run_charter.json"
-    charter_path.write_text(
-        json.dumps(
-        _charter_payload(
+    charter_path = tmp_path / ".agentmaestro" / "run_charter.json"
+    charter_path.write_bytes(
+        charter_bytes(
+            run_id=DEFAULT_RUN_ID,
+            slug="agent-slug",
             allowed_tools=allowed_tools,
             stop_conditions=stop_conditions,
             require_approval_for=require_approval_for,
         )
-        )
     )
     return charter_path
 
@@ -153,11 +114,20 @@ def _plan_payload(
             }
         ],
     }
-    for milestone in payload["milestones"]:
-        milestone.setdefault("description", "Contract milestone detail")
+    if milestones:
+        for milestone in milestones:
+            milestone.setdefault("description", "Contract milestone detail")
     return payload
 
 
+_DEFAULT_PLAN_BYTES = json.dumps(_plan_payload()).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def base_plan_payload() -> Dict[str, Any]:
+    return _plan_payload()
+
+
 def _write_plan(
     tmp_path: Path,
     *,
@@ -167,8 +137,16 @@ def _write_plan(
     plan_id: str = "plan-contract",
     complete: bool = True,
 ) -> Path:
-    plan_dir = tmp_path / ".agentmaestro" / "plans"
-    plan_dir.mkdir(parents=True, exist_ok=True)
+    plan_path = tmp_path / ".agentmaestro" / "plans" / f"{plan_id}.json"
+    if (
+        steps is None
+        and milestones is None
+        and complete
+        and run_id == DEFAULT_RUN_ID
+        and plan_id == "plan-contract"
+    ):
+        plan_path.write_bytes(_DEFAULT_PLAN_BYTES)
+        return plan_path
     payload = _plan_payload(
         run_id=run_id,
         plan_id=plan_id,
@@ -176,47 +154,39 @@ def _write_plan(
         milestones=milestones,
         complete=complete,
     )
-    plan_path = plan_dir / f"{plan_id}.json"
-    plan_path.write_text(json.dumps(payload))
+    plan_path.write_bytes(json.dumps(payload).encode("utf-8"))
     return plan_path
 
 
-def test_charter_schema_validates(tmp_path: Path):
-    agent_root = tmp_path / ".agentmaestro"
-    agent_root.mkdir(parents=True, exist_ok=True)
-    invalid = _charter_payload()
-    invalid.pop("slug")
-    (agent_root / "run_charter.json").write_text(json.dumps(invalid))
-
-    with pytest.raises(SchemaValidationError):
-        orchestrate(str(tmp_path))
-
-
-def test_plan_schema_validates(tmp_path: Path):
-    charter_path = _write_charter(tmp_path)
-    plan_dir = tmp_path / ".agentmaestro" / "plans"
-    plan_dir.mkdir(parents=True, exist_ok=True)
-    payload = _plan_payload()
-    payload.pop("goal")
-    (plan_dir / "plan-contract.json").write_text(json.dumps(payload))
-
-    with pytest.raises(SchemaValidationError):
-        orchestrate(str(tmp_path), str(charter_path))
-
-
-def test_tool_call_envelope_schema_validates(tmp_path: Path):
-    charter_path = _write_charter(tmp_path)
-    invalid_step = {
-        "step_id": "S001",
-        "intent": "missing args",
-        "tool_calls": [{"call_id": "C001", "tool": "run_command"}],
-        "acceptance_checks": [{"name": "check", "tool": "test_runner", "args": {}}],
-        "rollback": {"strategy": "none"},
-    }
-    _write_plan(tmp_path, steps=[invalid_step])
-
-    with pytest.raises(SchemaValidationError):
-        orchestrate(str(tmp_path), str(charter_path))
+@pytest.mark.parametrize(
+    "target, missing_key, expected_schema",
+    [
+        ("charter", "slug", "run_charter"),
+        ("plan", "goal", "plan"),
+        ("tool_call", "tool", "plan"),
+    ],
+)
+def test_schema_violations(
+    base_charter_payload: Dict[str, Any],
+    base_plan_payload: Dict[str, Any],
+    target: str,
+    missing_key: str,
+    expected_schema: str,
+):
+    charter = copy.deepcopy(base_charter_payload)
+    plan = copy.deepcopy(base_plan_payload)
+    if target == "charter":
+        charter.pop(missing_key)
+    elif target == "plan":
+        plan.pop(missing_key)
+    else:
+        plan["milestones"][0]["steps"][0]["tool_calls"][0].pop(missing_key)
+
+    # Same order orchestrate() validates in, without the file round-trip.
+    with pytest.raises(SchemaValidationError) as excinfo:
+        validate_run_charter(charter)
+        validate_plan(plan)
+    assert excinfo.value.schema_name == expected_schema
 
 
 def test_plan_semantics_blocks_disallowed_tool(tmp_path: Path):
@@ -241,16 +211,13 @@ def test_tool_ref_cannot_start_with_dash(tmp_path: Path):
         orchestrate(str(tmp_path), str(charter_path))
 
 
-def test_clamps_apply(tmp_path: Path):
-    charter_path = _write_charter(tmp_path)
-    orch = Orchestrator(Path(tmp_path), charter_path, tool_invoker=FakeToolInvoker())
-
+def test_clamps_apply():
     call = ToolCall(
         call_id="C001",
         tool="run_command",
         args={"timeout_ms": 2_000_000, "max_output_bytes": 2_000_000},
     )
-    clamped = orch.apply_call_clamps(call)
+    clamped = apply_call_clamps(call)
 
     assert clamped.args["timeout_ms"] == COMMAND_TIMEOUT * 1000
     assert clamped.args["max_output_bytes"] == OUTPUT_LIMIT
@@ -1,19 +1,12 @@
 from __future__ import annotations
 
-import importlib
-import hashlib
 import json
-import subprocess
-from datetime import datetime
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import pytest
 
-import pytest
-
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
 from toolrunner.app import orchestrator as orchestrator_module
 from toolrunner.app.models import (
     FileWriteArgs,
@@ -39,23 +32,37 @@ from toolrunner.app.tools.git_status import run_git_status
 from toolrunner.app.tools.run_command import run_command
 from toolrunner.app.tools.test_runner import run_tests
 
+from .helpers import charter_bytes
+
+if TYPE_CHECKING:
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel
+
 DEFAULT_RUN_ID = "run-loop"
 DEFAULT_MILESTONE_ID = "M001"
 DEFAULT_STEP_ID = "S001"
 
+# Every test gets the shared .agentmaestro plans/runs skeleton copied into its tmp_path.
+pytestmark = pytest.mark.usefixtures("agent_workspace")
+
 
 class FakeToolInvoker(ToolInvoker):
     def __init__(self, responses: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
         self.responses = responses or {}
-        self.calls: List[Dict[str, Any]] = []
+        self.calls: List[ToolCall] = []
+        self._templates: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
     def invoke(self, call: ToolCall, charter: RunCharter) -> Dict[str, Any]:
-        self.calls.append({"call_id": call.call_id, "tool": call.tool, "args": call.args})
-        response = self.responses.get(call.call_id) or self.responses.get(call.tool)
-        result: Dict[str, Any] = {"call_id": call.call_id, "tool": call.tool, "ok": True}
-        if response:
-            result.update(response)
-        return result
+        self.calls.append(call)
+        key = (call.call_id, call.tool)
+        template = self._templates.get(key)
+        if template is None:
+            template = {"call_id": call.call_id, "tool": call.tool, "ok": True}
+            response = self.responses.get(call.call_id) or self.responses.get(call.tool)
+            if response:
+                template.update(response)
+            self._templates[key] = template
+        return template.copy()
 
 
 class FakeMaestro:
@@ -68,30 +75,31 @@ class FakeMaestro:
         diff_summaries: Optional[List[Dict[str, Any]]] = None,
     ):
         self._plan = plan
-        self._review_states = review_states or ["done"]
-        self._repo_states = list(repo_states or [])
-        self._diff_summaries = list(diff_summaries or [])
+        self._review_states = deque(review_states or ["done"])
+        self._repo_states = deque(repo_states or [])
+        self._diff_summaries = deque(diff_summaries or [])
 
     def make_plan(self) -> Plan:
         return self._plan
 
     def review_progress(self, plan: Plan) -> str:
         if self._review_states:
-            return self._review_states.pop(0)
+            return self._review_states.popleft()
         return "done"
 
     def next_repo_state(self, changed_files: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         if not self._repo_states:
             return None
-        state = self._repo_states.pop(0)
-        if changed_files is not None:
+        state = self._repo_states.popleft()
+        # Scripted states usually carry changed_files already; only merge on a mismatch.
+        if changed_files is not None and state.get("changed_files") != changed_files:
             state = {**state, "changed_files": changed_files}
         return state
 
     def next_diff_summary(self) -> Optional[Dict[str, Any]]:
         if not self._diff_summaries:
             return None
-        return self._diff_summaries.pop(0)
+        return self._diff_summaries.popleft()
 
 
 class LoopOrchestrator(Orchestrator):
@@ -137,13 +145,15 @@ class LoopOrchestratorWithRollback(LoopOrchestrator):
 
 
 class RealToolInvoker(ToolInvoker):
-    TOOL_MAP: Dict[str, tuple[Callable[[Path, BaseModel], JSONResponse], BaseModel]] = {
-        "file_write": (write_file, FileWriteArgs),
-        "git_add": (run_git_add, GitAddArgs),
-        "git_commit": (run_git_commit, GitCommitArgs),
-        "git_status": (run_git_status, GitStatusArgs),
-        "run_command": (run_command, RunCommandArgs),
-        "test_runner": (run_tests, RunnerTestArgs),
+    TOOL_MAP: Dict[
+        str, tuple[Callable[[Path, BaseModel], JSONResponse], Callable[[Dict[str, Any]], BaseModel]]
+    ] = {
+        "file_write": (write_file, FileWriteArgs.model_validate),
+        "git_add": (run_git_add, GitAddArgs.model_validate),
+        "git_commit": (run_git_commit, GitCommitArgs.model_validate),
+        "git_status": (run_git_status, GitStatusArgs.model_validate),
+        "run_command": (run_command, RunCommandArgs.model_validate),
+        "test_runner": (run_tests, RunnerTestArgs.model_validate),
     }
 
     def __init__(self, run_dir: Path):
@@ -159,8 +169,8 @@ class RealToolInvoker(ToolInvoker):
                 "error": {"message": f"unknown tool {call.tool}"},
                 "result": None,
             }
-        tool_fn, model_cls = entry
-        args_instance = model_cls(**call.args)
+        tool_fn, validate_args = entry
+        args_instance = validate_args(call.args)
         response = tool_fn(self.run_dir, args_instance)
         payload = self._extract_payload(response)
         return {
@@ -173,12 +183,9 @@ class RealToolInvoker(ToolInvoker):
 
     @staticmethod
     def _extract_payload(response: Any) -> Dict[str, Any]:
-        body = getattr(response, "body", "")
-        if isinstance(body, bytes):
-            text = body.decode("utf-8")
-        else:
-            text = str(body)
-        return json.loads(text)
+        body = getattr(response, "body", b"{}")
+        assert isinstance(body, bytes), f"unexpected response body {type(body).__name__}"
+        return json.loads(body)
 
 
 def _write_charter(
@@ -187,48 +194,15 @@ def _write_charter(
     stop_conditions: Optional[Dict[str, int]] = None,
     require_approval_for: Optional[List[str]] = None,
 ) -> Path:
-    agent_root = tmp_path / ".agentmaestro"
-    agent_root.mkdir(parents=True, exist_ok=True)
-    payload = {
-        "schema_version": "1.0",
-        "run_id": DEFAULT_RUN_ID,
-        "slug": "agent-loop",
-        "created_at": "2026-01-01T00:00:00Z",
-        "repo_dir": ".",
-        "srs": {"path": "srs.md", "sha256": "a" * 64},
-        "models": {
-            "maestro": {"name": "maestro"},
-            "apprentice": {"name": "apprentice"},
-        },
-        "allowed_tools": {
-            "tier1": ["run_command", "format_runner"],
-            "tier2": [],
-            "git": ["git_status"],
-        },
-        "quality_gates": {
-            "default": [
-                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
-            ],
-            "on_merge_candidate": [
-                {"name": "format", "tool": "format_runner", "args": {"mode": "check"}}
-            ],
-        },
-        "branch_strategy": {
-            "type": "feature_branch",
-            "name_template": "agent/{run_id}/{slug}",
-            "base_branch": "main",
-        },
-        "stop_conditions": stop_conditions
-        or {"max_cycles": 10, "max_failures": 1, "max_minutes": 60},
-        "policies": {
-            "require_approval_for": require_approval_for or [],
-            "prohibit_outside_workspace": True,
-            "prefer_revert_over_reset": True,
-            "secrets_handling": "redact",
-        },
-    }
-    charter_path = agent_root / "run_charter.json"
-    charter_path.write_text(json.dumps(payload))
+    charter_path = tmp_path / ".agentmaestro" / "run_charter.json"
+    charter_path.write_bytes(
+        charter_bytes(
+            run_id=DEFAULT_RUN_ID,
+            slug="agent-loop",
+            stop_conditions=stop_conditions,
+            require_approval_for=require_approval_for,
+        )
+    )
     return charter_path
 
 
@@ -260,7 +234,7 @@ def _plan_payload(
     steps: Optional[List[Dict[str, Any]]] = None,
     complete: bool = True,
 ) -> Dict[str, Any]:
-    payload = {
+    return {
         "schema_version": "1.0",
         "plan_id": "plan-loop",
         "run_id": DEFAULT_RUN_ID,
@@ -277,9 +251,6 @@ def _plan_payload(
             }
         ],
     }
-    for milestone in payload["milestones"]:
-        milestone.setdefault("description", "Loop milestone detail")
-    return payload
 
 
 def _build_plan(**kwargs: Any) -> Plan:
@@ -288,14 +259,8 @@ def _build_plan(**kwargs: Any) -> Plan:
 
 
 def _step_report_path(tmp_path: Path, milestone_id: str = DEFAULT_MILESTONE_ID, step_id: str = DEFAULT_STEP_ID) -> Path:
-    return (
-        tmp_path
-        / ".agentmaestro"
-        / "runs"
-        / DEFAULT_RUN_ID
-        / "step_reports"
-        / milestone_id
-        / f"{step_id}.json"
+    return tmp_path.joinpath(
+        ".agentmaestro", "runs", DEFAULT_RUN_ID, "step_reports", milestone_id, f"{step_id}.json"
     )
 
 
@@ -322,11 +287,11 @@ def test_loop_simulation_happy_path(tmp_path: Path):
     assert result["status"] == "done"
     assert result["reason"] == "all milestones satisfied"
 
-    report = json.loads(_step_report_path(tmp_path).read_text())
+    report = json.loads(_step_report_path(tmp_path).read_bytes())
     assert report["status"] == "ok"
     assert report["verification"]["overall_pass"] is True
     assert report["repo_state"]["is_clean"] is True
-    assert invoker.calls[-1]["tool"] == "format_runner"
+    assert invoker.calls[-1].tool == "format_runner"
 
 
 def test_loop_simulation_tool_failure(tmp_path: Path):
@@ -364,7 +329,7 @@ def test_loop_simulation_tool_failure(tmp_path: Path):
     assert result["status"] == "failed"
     assert result["reason"] == "max_failures exceeded"
 
-    report = json.loads(_step_report_path(tmp_path).read_text())
+    report = json.loads(_step_report_path(tmp_path).read_bytes())
     assert report["status"] == "failed"
     assert report["tool_results"][-1]["ok"] is False
     assert report["repo_state"]["is_clean"] is False
@@ -395,7 +360,7 @@ def test_loop_simulation_gate_failure(tmp_path: Path):
     assert result["status"] == "failed"
     assert result["reason"] == "max_failures exceeded"
 
-    report = json.loads(_step_report_path(tmp_path).read_text())
+    report = json.loads(_step_report_path(tmp_path).read_bytes())
     assert report["status"] == "failed"
     assert report["verification"]["overall_pass"] is False
     assert report["verification"]["gates"][0]["ok"] is False
@@ -420,7 +385,7 @@ def test_loop_simulation_blocked_by_approval(tmp_path: Path):
     assert result["status"] == "blocked"
     assert result["reason"] == "approval denied"
     assert not _step_report_path(tmp_path).exists()
-    assert all(call["tool"] == "git_status" for call in invoker.calls)
+    assert all(call.tool == "git_status" for call in invoker.calls)
 
 
 def test_loop_simulation_max_minutes_blocks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
@@ -432,8 +397,15 @@ def test_loop_simulation_max_minutes_blocks(tmp_path: Path, monkeypatch: pytest.
     fake_maestro = FakeMaestro(plan)
     invoker = FakeToolInvoker()
 
-    sequence = iter([0.0, 120.0] + [120.0] * 50)
-    monkeypatch.setattr(orchestrator_module.time, "monotonic", lambda: next(sequence, 120.0))
+    polls = [0]
+
+    def fake_monotonic() -> float:
+        # Start at 0s, then report two minutes elapsed on every later poll.
+        poll = polls[0]
+        polls[0] = poll + 1
+        return 0.0 if poll == 0 else 120.0
+
+    monkeypatch.setattr(orchestrator_module.time, "monotonic", fake_monotonic)
 
     orchestrator = LoopOrchestrator(
         tmp_path,
@@ -498,9 +470,9 @@ def test_loop_simulation_clamp_overrides(tmp_path: Path):
     result = orchestrator.orchestrate()
 
     assert result["status"] == "done"
-    run_call = next(call for call in invoker.calls if call["tool"] == "run_command")
-    assert run_call["args"]["timeout_ms"] == 2048
-    assert run_call["args"]["max_output_bytes"] == 4096
+    run_call = next(call for call in invoker.calls if call.tool == "run_command")
+    assert run_call.args["timeout_ms"] == 2048
+    assert run_call.args["max_output_bytes"] == 4096
 
 
 def test_loop_simulation_rollback_called_on_failure(tmp_path: Path):
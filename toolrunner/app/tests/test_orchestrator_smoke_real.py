@@ -5,8 +5,9 @@ import shutil
 import subprocess
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, List, Optional
 
+import pytest
 from pydantic import BaseModel
 
 from toolrunner.app.models import (
@@ -17,7 +18,7 @@ from toolrunner.app.models import (
     RunCommandArgs,
     RunnerTestArgs,
 )
-from toolrunner.app.orchestrator import Orchestrator, Plan, ToolInvoker, now_iso
+from toolrunner.app.orchestrator import Orchestrator, Plan, ToolCall, ToolInvoker, now_iso
 from toolrunner.app.tools.file_write import write_file
 from toolrunner.app.tools.git_add import run_git_add
 from toolrunner.app.tools.git_commit import run_git_commit
@@ -30,6 +31,13 @@ PLAN_ID = "plan-smoke"
 MILESTONE_ID = "M001"
 STEP_ID = "S001"
 COMMIT_MESSAGE = "Add smoke files"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+GIT_IDENTITY_ENV = {
+    "GIT_AUTHOR_NAME": "Agent Maestro",
+    "GIT_AUTHOR_EMAIL": "agent@example.com",
+    "GIT_COMMITTER_NAME": "Agent Maestro",
+    "GIT_COMMITTER_EMAIL": "agent@example.com",
+}
 
 
 class FakeMaestro:
@@ -67,7 +75,7 @@ class SmokeLoopOrchestrator(Orchestrator):
 
 
 class RealToolInvoker(ToolInvoker):
-    TOOL_MAP: Dict[str, tuple[Any, BaseModel]] = {
+    TOOL_MAP: dict[str, tuple[Callable[..., Any], type[BaseModel]]] = {
         "file_write": (write_file, FileWriteArgs),
         "git_add": (run_git_add, GitAddArgs),
         "git_commit": (run_git_commit, GitCommitArgs),
@@ -76,16 +84,20 @@ class RealToolInvoker(ToolInvoker):
         "test_runner": (run_tests, RunnerTestArgs),
     }
 
+    # Validation and dispatch folded into one closure per tool, built once.
+    _DISPATCH: dict[str, Callable[[Path, dict[str, Any]], Any]] = {
+        name: (lambda run_dir, args, fn=fn, mc=mc: fn(run_dir, mc.model_validate(args)))
+        for name, (fn, mc) in TOOL_MAP.items()
+    }
+
     def __init__(self, run_dir: Path):
         self.run_dir = run_dir
 
-    def invoke(self, call: ToolCall, charter: Any) -> Dict[str, Any]:
-        entry = self.TOOL_MAP.get(call.tool)
-        if not entry:
+    def invoke(self, call: ToolCall, charter: Any) -> dict[str, Any]:
+        handler = self._DISPATCH.get(call.tool)
+        if handler is None:
             return {"call_id": call.call_id, "tool": call.tool, "ok": False, "error": {"message": f"unknown tool {call.tool}"}, "result": None}
-        tool_fn, model_cls = entry
-        args_instance = model_cls(**call.args)  # type: ignore[arg-type]
-        response = tool_fn(self.run_dir, args_instance)
+        response = handler(self.run_dir, call.args)
         payload = self._extract_payload(response)
         return {
             "call_id": call.call_id,
@@ -96,29 +108,29 @@ class RealToolInvoker(ToolInvoker):
         }
 
     @staticmethod
-    def _extract_payload(response: Any) -> Dict[str, Any]:
-        body = getattr(response, "body", "")
-        if isinstance(body, bytes):
-            text = body.decode("utf-8")
-        else:
-            text = str(body)
-        return json.loads(text)
+    def _extract_payload(response: Any) -> dict[str, Any]:
+        body = getattr(response, "body", b"")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return json.loads(body)
 
 
 def _smoke_workspace_root() -> Path:
-    root = Path(__file__).resolve().parents[2]
-    workspace = root / ".agentmaestro_smoke_ws"
+    workspace = REPO_ROOT / ".agentmaestro_smoke_ws"
     workspace.mkdir(exist_ok=True)
     return workspace
 
 
 def _init_git_repo(workspace: Path) -> None:
-    if workspace.exists():
-        shutil.rmtree(workspace, ignore_errors=True)
-    workspace.mkdir(parents=True, exist_ok=True)
-    subprocess.run(["git", "init"], cwd=workspace, check=True, capture_output=True)
-    subprocess.run(["git", "config", "user.email", "agent@example.com"], cwd=workspace, check=True, capture_output=True)
-    subprocess.run(["git", "config", "user.name", "Agent Maestro"], cwd=workspace, check=True, capture_output=True)
+    # Each run gets a fresh uuid-named workspace, so there is nothing to clear first.
+    workspace.mkdir(parents=True)
+    subprocess.run(
+        ["git", "init", "-q"],
+        cwd=workspace,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 def _write_smoke_charter(workspace: Path, run_id: str) -> Path:
@@ -167,94 +179,102 @@ def _write_smoke_charter(workspace: Path, run_id: str) -> Path:
         },
     }
     path = agent_root / "run_charter.json"
-    path.write_text(json.dumps(charter, indent=2))
+    path.write_bytes(json.dumps(charter, separators=(",", ":")).encode("utf-8"))
     return path
 
 
-def _build_smoke_plan(run_id: str) -> Plan:
-    payload = {
-        "schema_version": "1.0",
-        "plan_id": PLAN_ID,
-        "run_id": run_id,
-        "created_at": now_iso(),
-        "goal": "execute smoke workflow",
-        "assumptions": ["Smoke plan assumption"],
-        "complete": True,
-        "milestones": [
-            {
-                "milestone_id": MILESTONE_ID,
-                "title": "Smoke milestone",
-                "description": "Smoke milestone detail",
-                "steps": [
-                    {
-                        "step_id": STEP_ID,
-                        "intent": "create files, commit, and test",
-                        "tool_calls": [
-                            {
-                                "call_id": "C000",
-                                "tool": "file_write",
-                                "args": {
-                                    "path": ".gitignore",
-                                    "content": ".agentmaestro/\n",
-                                    "mode": "text",
-                                    "overwrite": True,
-                                },
-                            },
-                            {
-                                "call_id": "C001",
-                                "tool": "file_write",
-                                "args": {
-                                    "path": "hello.py",
-                                    "content": "def greet():\n    return 'Hello, smoke!'\n",
-                                    "mode": "text",
-                                    "overwrite": True,
-                                },
+_SMOKE_PLAN_PAYLOAD = {
+    "schema_version": "1.0",
+    "plan_id": PLAN_ID,
+    "run_id": RUN_ID,
+    "created_at": now_iso(),
+    "goal": "execute smoke workflow",
+    "assumptions": ["Smoke plan assumption"],
+    "complete": True,
+    "milestones": [
+        {
+            "milestone_id": MILESTONE_ID,
+            "title": "Smoke milestone",
+            "description": "Smoke milestone detail",
+            "steps": [
+                {
+                    "step_id": STEP_ID,
+                    "intent": "create files, commit, and test",
+                    "tool_calls": [
+                        {
+                            "call_id": "C000",
+                            "tool": "file_write",
+                            "args": {
+                                "path": ".gitignore",
+                                "content": ".agentmaestro/\n",
+                                "mode": "text",
+                                "overwrite": True,
                             },
-                            {
-                                "call_id": "C002",
-                                "tool": "file_write",
-                                "args": {
-                                    "path": "test_hello.py",
-                                    "content": "from hello import greet\n\n\ndef test_greet():\n    assert greet() == 'Hello, smoke!'\n",
-                                    "mode": "text",
-                                    "overwrite": True,
-                                },
+                        },
+                        {
+                            "call_id": "C001",
+                            "tool": "file_write",
+                            "args": {
+                                "path": "hello.py",
+                                "content": "def greet():\n    return 'Hello, smoke!'\n",
+                                "mode": "text",
+                                "overwrite": True,
                             },
-                            {
-                                "call_id": "C003",
-                                "tool": "git_add",
-                                "args": {"paths": [".gitignore", "hello.py", "test_hello.py"]},
+                        },
+                        {
+                            "call_id": "C002",
+                            "tool": "file_write",
+                            "args": {
+                                "path": "test_hello.py",
+                                "content": "from hello import greet\n\n\ndef test_greet():\n    assert greet() == 'Hello, smoke!'\n",
+                                "mode": "text",
+                                "overwrite": True,
                             },
-                            {
-                                "call_id": "C004",
-                                "tool": "git_commit",
-                                "args": {"message": COMMIT_MESSAGE},
+                        },
+                        {
+                            "call_id": "C003",
+                            "tool": "git_add",
+                            "args": {"paths": [".gitignore", "hello.py", "test_hello.py"]},
+                        },
+                        {
+                            "call_id": "C004",
+                            "tool": "git_commit",
+                            "args": {"message": COMMIT_MESSAGE},
+                        },
+                    ],
+                    "acceptance_checks": [
+                        {
+                            "name": "pytest smoke",
+                            "tool": "test_runner",
+                            "args": {
+                                "kind": "pytest",
+                                "pytest_args": ["test_hello.py"],
                             },
-                        ],
-                        "acceptance_checks": [
-                            {
-                                "name": "pytest smoke",
-                                "tool": "test_runner",
-                                "args": {
-                                    "kind": "pytest",
-                                    "pytest_args": ["test_hello.py"],
-                                },
-                            }
-                        ],
-                        "rollback": {"strategy": "none"},
-                    }
-                ],
-            }
-        ],
-    }
-    return Plan.model_validate(payload)
+                        }
+                    ],
+                    "rollback": {"strategy": "none"},
+                }
+            ],
+        }
+    ],
+}
+_SMOKE_PLAN = Plan.model_validate(_SMOKE_PLAN_PAYLOAD)
+
+
+def _build_smoke_plan(run_id: str) -> Plan:
+    # Deep copy: the orchestrator rewrites step tool calls in place.
+    return _SMOKE_PLAN.model_copy(update={"run_id": run_id}, deep=True)
 
 
 def _step_report_path(workspace: Path) -> Path:
     return workspace / ".agentmaestro" / "runs" / RUN_ID / "step_reports" / MILESTONE_ID / f"{STEP_ID}.json"
 
 
-def test_orchestrator_smoke_real():
+def test_orchestrator_smoke_real(monkeypatch: pytest.MonkeyPatch):
+    # git_commit runs git through run_command, which inherits os.environ; set the
+    # identity there instead of writing it into each repo's config.
+    for key, value in GIT_IDENTITY_ENV.items():
+        monkeypatch.setenv(key, value)
     workspace_root = _smoke_workspace_root()
     workspace = workspace_root / f"run-{uuid.uuid4().hex}"
     try:
@@ -294,4 +314,6 @@ def test_orchestrator_smoke_real():
             capture_output=True,
             text=True,
         )
-      
\ No newline at end of file
+        assert git_status.stdout.strip() == ""
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
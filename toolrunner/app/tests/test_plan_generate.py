@@ -1,41 +1,59 @@
+import asyncio
 from pathlib import Path
 
-from fastapi.testclient import TestClient
+import httpx
+import pytest
 
 from toolrunner.app.main import app
 from toolrunner.app.schemas import validate_plan
 
-client = TestClient(app)
-
+RUNS_ROOT = Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs"
+LOCKED_SECTIONS = {
+    "project_summary": "Executive summary.\n- Value proposition\n",
+    "goals_non_goals": "Goals and non-goals.\n- Goal 1\n- Non-goal A\n",
+    "functional_requirements": "- FR1\n- FR2\n- FR3\n- FR4\n",
+    "acceptance_criteria": "- AC1\n- AC2\n- AC3\n",
+}
+
+
+async def _lock_sections(run_id: str, sections: dict[str, str]) -> list[httpx.Response]:
+    # Each lock touches a distinct section, so the posts can be issued together.
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        return await asyncio.gather(
+            *(
+                async_client.post(
+                    f"/v1/runs/{run_id}/srs/sections/{section_id}",
+                    json={"content": content, "action": "lock"},
+                )
+                for section_id, content in sections.items()
+            )
+        )
+
+
+@pytest.fixture(scope="module")
+def locked_run(client) -> str:
+    """A run whose SRS sections required for plan generation are already locked."""
+    response = client.post("/v1/runs", json={"slug": "plan-test"})
+    run_id = response.json()["run_id"]
 
-def _lock_section(run_id: str, section_id: str, content: str) -> None:
-    response = client.post(
-        f"/v1/runs/{run_id}/srs/sections/{section_id}",
-        json={"content": content, "action": "lock"},
-    )
-    assert response.status_code == 200
+    responses = asyncio.run(_lock_sections(run_id, LOCKED_SECTIONS))
+    assert [response.status_code for response in responses] == [200] * len(LOCKED_SECTIONS)
+    return run_id
 
 
-def test_plan_generate_requires_locked_sections():
-    response = client.post("/v1/runs", json={"slug": "plan-test"})
-    run_id = response.json()["run_id"]
+def test_plan_generate_requires_locked_sections(client, seeded_run: str):
+    run_id = seeded_run
 
     response = client.post(f"/v1/runs/{run_id}/plan/generate")
     assert response.status_code == 400
 
     sections = client.get(f"/v1/runs/{run_id}/srs/sections").json()
-    assert not (Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs" / run_id / "plans").exists()
-
-
-def test_plan_generate_persists_schema_valid_plan():
-    response = client.post("/v1/runs", json={"slug": "plan-test"})
-    run_id = response.json()["run_id"]
+    assert not (RUNS_ROOT / run_id / "plans").exists()
 
-    _lock_section(run_id, "project_summary", "Executive summary.\n- Value proposition\n")
-    _lock_section(run_id, "goals_non_goals", "Goals and non-goals.\n- Goal 1\n- Non-goal A\n")
-    _lock_section(run_id, "functional_requirements", "- FR1\n- FR2\n- FR3\n- FR4\n")
-    _lock_section(run_id, "acceptance_criteria", "- AC1\n- AC2\n- AC3\n")
 
+def test_plan_generate_persists_schema_valid_plan(client, locked_run: str):
+    run_id = locked_run
     gen_resp = client.post(f"/v1/runs/{run_id}/plan/generate")
     assert gen_resp.status_code == 200
 
@@ -46,7 +64,7 @@ def test_plan_generate_persists_schema_valid_plan():
     assert plan["run_id"] == run_id
     assert plan["milestones"]
 
-    run_root = Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs" / run_id
+    run_root = RUNS_ROOT / run_id
     plan_path = run_root / "plans" / f"{plan['plan_id']}.json"
     latest_path = run_root / "plans" / "latest.json"
     assert plan_path.exists()
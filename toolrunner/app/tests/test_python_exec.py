@@ -12,8 +12,24 @@ def fake_subprocess(stdout="ok", stderr="", returncode=0):
     return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
 
 
-def test_python_snippet(monkeypatch, tmp_path):
-    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: fake_subprocess(stdout="snippet"))
+_FILE_B64 = base64.b64encode(b"print('from file')").decode("ascii")
+_BAD_B64 = base64.b64encode(b"print('bad')").decode("ascii")
+_SNIPPET_RESULT = fake_subprocess(stdout="snippet")
+_FILES_RESULT = fake_subprocess(stdout="files")
+
+
+@pytest.fixture
+def patch_run(monkeypatch):
+    """Make ``subprocess.run`` return a prebuilt ``CompletedProcess``."""
+
+    def _patch(result: subprocess.CompletedProcess) -> None:
+        monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: result)
+
+    return _patch
+
+
+def test_python_snippet(patch_run, tmp_path):
+    patch_run(_SNIPPET_RESULT)
     args = PythonArgs(code="print('hai')")
     code, out, err = run_python(tmp_path, args, timeout_s=5, max_output_bytes=256)
     assert code == 0
@@ -32,13 +48,9 @@ def test_python_timeout(monkeypatch, tmp_path):
     assert out == ""
 
 
-def test_python_files(monkeypatch, tmp_path):
-    def fake_run(*args, **kwargs):
-        return fake_subprocess(stdout="files")
-
-    monkeypatch.setattr(subprocess, "run", fake_run)
-    content = base64.b64encode(b"print('from file')").decode("utf-8")
-    file_item = PythonFileItem(path="scripts/run.py", content_b64=content)
+def test_python_files(patch_run, tmp_path):
+    patch_run(_FILES_RESULT)
+    file_item = PythonFileItem(path="scripts/run.py", content_b64=_FILE_B64)
     args = PythonArgs(files=[file_item], entrypoint="scripts/run.py")
     code, out, err = run_python(tmp_path, args, timeout_s=5, max_output_bytes=256)
     assert code == 0
@@ -48,7 +60,7 @@ def test_python_files(monkeypatch, tmp_path):
 
 
 def test_python_file_traversal_rejected(tmp_path):
-    file_item = PythonFileItem(path="../escape/run.py", content_b64=base64.b64encode(b"print('bad')").decode("utf-8"))
+    file_item = PythonFileItem(path="../escape/run.py", content_b64=_BAD_B64)
     args = PythonArgs(files=[file_item], entrypoint="../escape/run.py")
     with pytest.raises(ValueError):
         run_python(tmp_path, args, timeout_s=5, max_output_bytes=256)
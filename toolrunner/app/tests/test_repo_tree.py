@@ -1,76 +1,99 @@
-import json
 from pathlib import Path
 
+import pytest
+
 from toolrunner.app.models import RepoTreeArgs
 from toolrunner.app.tools.repo_tree import list_repo_tree
 
-
-def _payload(response):
-    return json.loads(response.body)
+from .helpers import response_payload
 
 
-def test_repo_tree_basic(tmp_path: Path):
-    (tmp_path / "alpha" / "beta").mkdir(parents=True)
-    (tmp_path / "alpha" / "beta" / "foo.txt").write_text("foo")
-    (tmp_path / "root.txt").write_text("root")
-    response = list_repo_tree(tmp_path, RepoTreeArgs())
-    payload = _payload(response)
-    entries = payload["result"]["entries"]
-    assert payload["ok"]
-    assert payload["result"]["stats"]["dirs"] == 2
-    assert payload["result"]["stats"]["files"] == 2
-    assert entries[0]["path"] == "alpha"
-    assert entries[1]["path"] == "alpha/beta"
-    assert entries[2]["path"] == "alpha/beta/foo.txt"
-    assert entries[2]["depth"] == 3
-    assert entries[-1]["path"] == "root.txt"
-    assert "size_bytes" in entries[0]
-    assert entries[-1]["size_bytes"] == 4
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory) -> Path:
+    """One scaffold shared by every listing case; list_repo_tree only reads it."""
+    root = tmp_path_factory.mktemp("tree")
+    (root / "alpha" / "beta").mkdir(parents=True)
+    (root / "alpha" / "beta" / "foo.txt").write_text("foo")
+    (root / "root.txt").write_text("root")
+    (root / ".git").mkdir()
+    (root / ".git" / "config").write_text("skip")
+    (root / "docs").mkdir()
+    (root / "docs" / "README.md").write_text("# doc")
+    (root / "notes.txt").write_text("keep")
+    return root
 
 
-def test_repo_tree_max_depth(tmp_path: Path):
-    (tmp_path / "alpha" / "beta").mkdir(parents=True)
-    (tmp_path / "alpha" / "beta" / "foo.txt").write_text("foo")
-    (tmp_path / "root.txt").write_text("root")
-    response = list_repo_tree(tmp_path, RepoTreeArgs(max_depth=2))
-    payload = _payload(response)
-    candidates = [entry["path"] for entry in payload["result"]["entries"]]
-    assert "alpha/beta/foo.txt" not in candidates
-    assert payload["result"]["stats"]["files"] == 1
-    assert payload["result"]["stats"]["dirs"] == 2
+ALL_PATHS = [
+    ".git",
+    ".git/config",
+    "alpha",
+    "alpha/beta",
+    "alpha/beta/foo.txt",
+    "docs",
+    "docs/README.md",
+    "notes.txt",
+    "root.txt",
+]
 
 
-def test_repo_tree_max_entries(tmp_path: Path):
-    for name in ("a.txt", "b.txt", "c.txt"):
-        (tmp_path / name).write_text(name)
-    response = list_repo_tree(tmp_path, RepoTreeArgs(max_entries=2))
-    payload = _payload(response)
-    entries = payload["result"]["entries"]
-    assert len(entries) == 2
-    assert payload["result"]["truncated"] is True
-    assert entries[0]["path"] == "a.txt"
-    assert entries[1]["path"] == "b.txt"
-    assert payload["result"]["stats"]["entries"] == 2
+@pytest.mark.parametrize(
+    ("args", "expected_stats", "expected_paths", "truncated"),
+    [
+        pytest.param(
+            RepoTreeArgs(),
+            {"files": 5, "dirs": 4, "entries": 9},
+            ALL_PATHS,
+            False,
+            id="basic",
+        ),
+        pytest.param(
+            RepoTreeArgs(max_depth=2),
+            {"files": 4, "dirs": 4, "entries": 8},
+            [path for path in ALL_PATHS if path != "alpha/beta/foo.txt"],
+            False,
+            id="max_depth",
+        ),
+        pytest.param(
+            RepoTreeArgs(max_entries=2),
+            {"files": 0, "dirs": 2, "entries": 2},
+            [".git", "alpha"],
+            True,
+            id="max_entries",
+        ),
+        pytest.param(
+            RepoTreeArgs(include_globs=["**/*.md"]),
+            {"files": 1, "dirs": 0, "entries": 1},
+            ["docs/README.md"],
+            False,
+            id="include_globs",
+        ),
+    ],
+)
+def test_repo_tree_listing(
+    tree: Path,
+    args: RepoTreeArgs,
+    expected_stats: dict,
+    expected_paths: list[str],
+    truncated: bool,
+):
+    payload = response_payload(list_repo_tree(tree, args))
+    assert payload["ok"]
+    result = payload["result"]
+    assert [entry["path"] for entry in result["entries"]] == expected_paths
+    assert result["stats"] == expected_stats
+    assert result["truncated"] is truncated
 
 
-def test_repo_tree_include_exclude_globs(tmp_path: Path):
-    (tmp_path / ".git").mkdir()
-    (tmp_path / ".git" / "config").write_text("skip")
-    (tmp_path / "docs").mkdir()
-    (tmp_path / "docs" / "README.md").write_text("# doc")
-    (tmp_path / "notes.txt").write_text("keep")
-    response = list_repo_tree(tmp_path, RepoTreeArgs(include_globs=["**/*.md"]))
-    payload = _payload(response)
-    entries = [entry["path"] for entry in payload["result"]["entries"]]
-    assert entries == ["docs/README.md"]
-    assert ".git/config" not in entries
-    assert payload["result"]["stats"]["files"] == 1
+def test_repo_tree_metadata(tree: Path):
+    payload = response_payload(list_repo_tree(tree, RepoTreeArgs()))
+    entries = {entry["path"]: entry for entry in payload["result"]["entries"]}
+    assert entries["alpha/beta/foo.txt"]["depth"] == 3
+    assert "size_bytes" in entries["alpha"]
+    assert entries["root.txt"]["size_bytes"] == 4
 
 
-def test_repo_tree_without_metadata(tmp_path: Path):
-    (tmp_path / "meta.txt").write_text("payload")
-    response = list_repo_tree(tmp_path, RepoTreeArgs(include_metadata=False))
-    payload = _payload(response)
+def test_repo_tree_without_metadata(tree: Path):
+    payload = response_payload(list_repo_tree(tree, RepoTreeArgs(include_metadata=False)))
     entry = payload["result"]["entries"][0]
     assert "size_bytes" not in entry
     assert "mtime_epoch" not in entry
@@ -1,21 +1,31 @@
-﻿import json
+﻿import subprocess
 import sys
 from pathlib import Path
 
-from fastapi.responses import JSONResponse
+import pytest
 
 from toolrunner.app.models import RunCommandArgs
 from toolrunner.app.tools.run_command import run_command
 
+from .helpers import response_payload
 
-def _payload(response: JSONResponse) -> dict:
-    return json.loads(response.body)
 
+@pytest.fixture(scope="session", autouse=True)
+def warm_python() -> None:
+    """Launch the interpreter once up front so the first timed command starts warm."""
+    subprocess.run([sys.executable, "-c", "pass"], check=True, stdout=subprocess.DEVNULL)
 
-def test_run_command_success(tmp_path: Path):
+
+@pytest.fixture(scope="module")
+def ws(tmp_path_factory) -> Path:
+    """Run directory shared by tests whose commands leave nothing behind."""
+    return tmp_path_factory.mktemp("run_cmd")
+
+
+def test_run_command_success(ws: Path):
     args = RunCommandArgs(cmd=[sys.executable, "-c", "print('hello world')"], cwd=".")
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert payload["ok"]
     result = payload["result"]
     assert result["exit_code"] == 0
@@ -24,37 +34,37 @@ def test_run_command_success(tmp_path: Path):
     assert not result["stdout_truncated"]
 
 
-def test_run_command_env_and_cwd(tmp_path: Path):
-    (tmp_path / "subdir").mkdir()
+def test_run_command_env_and_cwd(ws: Path):
+    (ws / "subdir").mkdir(exist_ok=True)
     args = RunCommandArgs(
         cmd=[sys.executable, "-c", "import os; print(os.getenv('FOO'))"],
         cwd="subdir",
         env={"FOO": "value"},
     )
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert payload["ok"]
     assert payload["result"]["stdout"].strip() == "value"
 
 
-def test_run_command_with_stdin(tmp_path: Path):
+def test_run_command_with_stdin(ws: Path):
     args = RunCommandArgs(
         cmd=[sys.executable, "-c", "import sys; print(sys.stdin.read())"],
         stdin_text="line1\nline2",
     )
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert payload["ok"]
     assert "line1" in payload["result"]["stdout"]
 
 
-def test_run_command_truncation_respects_bytes(tmp_path: Path):
+def test_run_command_truncation_respects_bytes(ws: Path):
     args = RunCommandArgs(
         cmd=[sys.executable, "-c", "print('\\u20AC' * 20)"],
         max_output_bytes=10,
     )
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     result = payload["result"]
     stdout = result["stdout"]
     assert result["stdout_truncated"]
@@ -72,37 +82,37 @@ def test_run_command_timeout_kills(tmp_path: Path):
         timeout_ms=10,
     )
     response = run_command(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
     result = payload["result"]
     assert payload["ok"]
     assert result["timed_out"]
     assert result["exit_code"] is None
 
 
-def test_run_command_nonexistent_cwd(tmp_path: Path):
+def test_run_command_nonexistent_cwd(ws: Path):
     args = RunCommandArgs(
         cmd=[sys.executable, "-c", "print('ok')"],
         cwd="does-not-exist",
     )
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert not payload["ok"]
     assert payload["error"]["code"].endswith("NOT_FOUND")
     assert payload["error"]["details"]["cwd"] == "does-not-exist"
 
 
-def test_run_command_path_escape(tmp_path: Path):
+def test_run_command_path_escape(ws: Path):
     args = RunCommandArgs(cmd=[sys.executable, "-c", "print('ok')"], cwd="../outside")
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert not payload["ok"]
     assert payload["error"]["code"].endswith("PATH_OUTSIDE_WORKSPACE")
 
 
-def test_run_command_command_missing(tmp_path: Path):
+def test_run_command_command_missing(ws: Path):
     args = RunCommandArgs(cmd=["nonexistent-command-xyz"])
-    response = run_command(tmp_path, args)
-    payload = _payload(response)
+    response = run_command(ws, args)
+    payload = response_payload(response)
     assert not payload["ok"]
     assert payload["error"]["code"].endswith("NOT_FOUND")
     assert payload["error"]["details"].get("cmd0") == "nonexistent-command-xyz"
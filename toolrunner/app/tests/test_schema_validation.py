@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from toolrunner.app.schemas import (
@@ -8,9 +10,8 @@ from toolrunner.app.schemas import (
     validate_tool_call_envelope,
 )
 
-
-def _run_charter_payload() -> dict:
-    return {
+_RUN_CHARTER_TEMPLATE = json.dumps(
+    {
         "schema_version": "1.0",
         "run_id": "agent123",
         "slug": "agent-slug",
@@ -43,6 +44,11 @@ def _run_charter_payload() -> dict:
             "secrets_handling": "redact",
         },
     }
+)
+
+
+def _run_charter_payload() -> dict:
+    return json.loads(_RUN_CHARTER_TEMPLATE)
 
 
 def test_validate_run_charter_success():
@@ -54,8 +60,8 @@ def test_validate_run_charter_missing_required():
         validate_run_charter({})
 
 
-def _plan_payload() -> dict:
-    payload = {
+_PLAN_TEMPLATE = json.dumps(
+    {
         "schema_version": "1.0",
         "plan_id": "plan123",
         "run_id": "agent123",
@@ -83,9 +89,11 @@ def _plan_payload() -> dict:
             }
         ],
     }
-    for milestone in payload["milestones"]:
-        milestone.setdefault("description", "Primary milestone")
-    return payload
+)
+
+
+def _plan_payload() -> dict:
+    return json.loads(_PLAN_TEMPLATE)
 
 
 def test_validate_plan_success():
@@ -99,8 +107,8 @@ def test_validate_plan_missing_step():
         validate_plan(payload)
 
 
-def _step_report_payload() -> dict:
-    return {
+_STEP_REPORT_TEMPLATE = json.dumps(
+    {
         "schema_version": "1.0",
         "run_id": "agent123",
         "plan_id": "plan123",
@@ -114,6 +122,11 @@ def _step_report_payload() -> dict:
         ],
         "repo_state": {"branch": "main", "head_oid": "abc", "is_clean": True, "changed_files": []},
     }
+)
+
+
+def _step_report_payload() -> dict:
+    return json.loads(_STEP_REPORT_TEMPLATE)
 
 
 def test_validate_step_report_success():
@@ -127,13 +140,18 @@ def test_validate_step_report_blocked_requires_reason():
         validate_step_report(payload)
 
 
-def _tool_call_payload() -> dict:
-    return {
+_TOOL_CALL_TEMPLATE = json.dumps(
+    {
         "schema_version": "1.0",
         "call_id": "C001",
         "tool": "file_read",
         "args": {"path": "README.md"},
     }
+)
+
+
+def _tool_call_payload() -> dict:
+    return json.loads(_TOOL_CALL_TEMPLATE)
 
 
 def test_validate_tool_call_envelope_success():
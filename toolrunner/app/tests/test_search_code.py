@@ -1,13 +1,9 @@
-import json
-
 from pathlib import Path
 
 from toolrunner.app.models import SearchCodeArgs
 from toolrunner.app.tools.search_code import list_search_code
 
-
-def _payload(response):
-    return json.loads(response.body)
+from .helpers import response_payload
 
 
 def test_search_code_literal(tmp_path: Path):
@@ -29,7 +25,7 @@ def test_search_code_literal(tmp_path: Path):
         include_globs=["**/*.py"],
     )
     response = list_search_code(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
     assert payload["ok"]
     result = payload["result"]
     assert result["stats"]["files_scanned"] == 1
@@ -51,7 +47,7 @@ def test_search_code_truncated_max_results(tmp_path: Path):
         (tmp_path / name).write_text("match_term\n")
     args = SearchCodeArgs(query="match_term", include_globs=["**/*.py"], max_results=2)
     response = list_search_code(tmp_path, args)
-    payload = _payload(response)
+    payload = response_payload(response)
     assert payload["ok"]
     result = payload["result"]
     assert result["truncated"] is True
@@ -65,7 +61,7 @@ def test_search_code_truncated_max_results(tmp_path: Path):
 
 def test_search_code_invalid_regex(tmp_path: Path):
     response = list_search_code(tmp_path, SearchCodeArgs(query="(unclosed", is_regex=True))
-    payload = _payload(response)
+    payload = response_payload(response)
     assert payload["ok"] is False
     assert payload["error"]["code"].endswith("INVALID_ARGUMENT")
     assert "unclosed" in payload["error"]["details"]["query"]
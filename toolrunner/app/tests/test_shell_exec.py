@@ -1,21 +1,23 @@
 import subprocess
-from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from toolrunner.app.tools.shell_exec import run_shell
 
 
-def test_shell_exec_allowed(monkeypatch, tmp_path):
-    seen = {}
+@pytest.fixture(autouse=True)
+def fake_subprocess_run(monkeypatch) -> MagicMock:
+    """Stand-in for ``subprocess.run``; tests set ``return_value`` or ``side_effect``."""
+    mock = MagicMock()
+    monkeypatch.setattr(subprocess, "run", mock)
+    return mock
 
-    def fake_run(cmd, **kwargs):
-        seen["cmd"] = cmd
-        seen["cwd"] = kwargs.get("cwd")
-        seen["env"] = kwargs.get("env")
-        return subprocess.CompletedProcess(args=[], returncode=0, stdout="ok", stderr="")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+def test_shell_exec_allowed(fake_subprocess_run, tmp_path):
+    fake_subprocess_run.return_value = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout="ok", stderr=""
+    )
     code, out, err = run_shell(
         tmp_path,
         ["pytest", "-q"],
@@ -27,34 +29,28 @@ def test_shell_exec_allowed(monkeypatch, tmp_path):
     assert code == 0
     assert "ok" in out
     assert err == ""
-    assert seen["cwd"] == tmp_path
-    assert seen["cmd"] == ["pytest", "-q"]
+    (cmd,), kwargs = fake_subprocess_run.call_args
+    assert kwargs["cwd"] == tmp_path
+    assert cmd == ["pytest", "-q"]
 
 
-def test_shell_exec_blocked(monkeypatch, tmp_path):
+def test_shell_exec_blocked(fake_subprocess_run, tmp_path):
     with pytest.raises(ValueError):
         run_shell(tmp_path, ["bash"], cwd=".", timeout_s=5, max_output_bytes=128)
+    fake_subprocess_run.assert_not_called()
 
 
-def test_shell_exec_timeout(monkeypatch, tmp_path):
-    def fake_timeout(*args, **kwargs):
-        raise subprocess.TimeoutExpired(cmd="cmd", timeout=5)
-
-    monkeypatch.setattr(subprocess, "run", fake_timeout)
+def test_shell_exec_timeout(fake_subprocess_run, tmp_path):
+    fake_subprocess_run.side_effect = subprocess.TimeoutExpired(cmd="cmd", timeout=5)
     code, out, err = run_shell(tmp_path, ["pytest"], cwd=".", timeout_s=5, max_output_bytes=128)
     assert code is None
     assert err == ""
 
 
-def test_shell_exec_truncates_output(monkeypatch, tmp_path):
-    long_text = "x" * 500
-
-    def fake_run(*args, **kwargs):
-        return subprocess.CompletedProcess(
-            args=[], returncode=0, stdout=long_text, stderr="err" * 100
-        )
-
-    monkeypatch.setattr(subprocess, "run", fake_run)
+def test_shell_exec_truncates_output(fake_subprocess_run, tmp_path):
+    fake_subprocess_run.return_value = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout="x" * 500, stderr="err" * 100
+    )
     code, out, err = run_shell(tmp_path, ["pytest"], cwd=".", timeout_s=5, max_output_bytes=10)
     assert code == 0
     assert out.endswith("…")
@@ -1,14 +1,15 @@
+import json
 from pathlib import Path
 
-import json
 import pytest
 
 from toolrunner.app.srs_builder import SRSBuilder, SRSSection
 
 
-@pytest.fixture
-def minimal_sections() -> list[SRSSection]:
-    return [
+@pytest.fixture(scope="session")
+def minimal_sections() -> tuple[SRSSection, ...]:
+    """Frozen sections shared by every test; SRSBuilder copies them into its own list."""
+    return (
         SRSSection(
             section_id="summary",
             title="Project Summary",
@@ -16,12 +17,16 @@ def minimal_sections() -> list[SRSSection]:
             template="One paragraph summary.",
             checklist=["Clearly describe purpose."],
             example="Summarize the project succinctly.",
-        )
-    ]
+        ),
+    )
+
+
+@pytest.fixture
+def builder(minimal_sections, tmp_path: Path) -> SRSBuilder:
+    return SRSBuilder(tmp_path, sections=minimal_sections)
 
 
-def test_prompts_show_template(minimal_sections, tmp_path: Path):
-    builder = SRSBuilder(tmp_path, sections=minimal_sections)
+def test_prompts_show_template(builder: SRSBuilder):
     section = builder.current_section()
     prompt = builder.prompt(section.section_id)
     assert prompt["title"] == "Project Summary"
@@ -29,8 +34,7 @@ def test_prompts_show_template(minimal_sections, tmp_path: Path):
     assert prompt["locked"] is False
 
 
-def test_record_section_writes_files(minimal_sections, tmp_path: Path):
-    builder = SRSBuilder(tmp_path, sections=minimal_sections)
+def test_record_section_writes_files(builder: SRSBuilder, tmp_path: Path):
     section = builder.current_section()
     content = "This project builds a testable SRS."
     locked = builder.record_section(section.section_id, content)
@@ -43,14 +47,12 @@ def test_record_section_writes_files(minimal_sections, tmp_path: Path):
     assert lock_data["locked_sections"][section.section_id]["sha256"] == locked["sha256"]
 
 
-def test_empty_content_rejected(minimal_sections, tmp_path: Path):
-    builder = SRSBuilder(tmp_path, sections=minimal_sections)
+def test_empty_content_rejected(builder: SRSBuilder):
     with pytest.raises(ValueError):
         builder.record_section("summary", "   ")
 
 
-def test_pending_sections_reflects_progress(minimal_sections, tmp_path: Path):
-    builder = SRSBuilder(tmp_path, sections=minimal_sections)
+def test_pending_sections_reflects_progress(builder: SRSBuilder):
     assert builder.pending_sections()
     builder.record_section("summary", "done")
     assert builder.pending_sections() == []
@@ -3,14 +3,10 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from fastapi.testclient import TestClient
+RUNS_ROOT = Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs"
 
-from toolrunner.app.main import app
 
-client = TestClient(app)
-
-
-def test_srs_draft_and_lock_persists():
+def test_srs_draft_and_lock_persists(client):
     response = client.post("/v1/runs", json={"slug": "srs-test"})
     run_id = response.json().get("run_id")
     assert run_id
@@ -38,8 +34,7 @@ def test_srs_draft_and_lock_persists():
         json={"content": "Final content", "action": "lock"},
     )
 
-    root = Path(__file__).resolve().parents[2]
-    run_root = root / ".agentmaestro" / "runs" / run_id
+    run_root = RUNS_ROOT / run_id
     srs_md_path = run_root / "srs" / "SRS.md"
     assert srs_md_path.exists()
     assert f"## {title}" in srs_md_path.read_text()
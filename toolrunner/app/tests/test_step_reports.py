@@ -3,18 +3,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from fastapi.testclient import TestClient
+RUNS_ROOT = Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs"
 
-from toolrunner.app.main import app
 
-client = TestClient(app)
-
-
-def test_step_report_endpoints_populated():
-    response = client.post("/v1/runs", json={"slug": "reports-test"})
-    run_id = response.json()["run_id"]
-
-    run_root = Path(__file__).resolve().parents[2] / ".agentmaestro" / "runs" / run_id
+def test_step_report_endpoints_populated(client, seeded_run: str):
+    run_id = seeded_run
+    run_root = RUNS_ROOT / run_id
     report_path = run_root / "step_reports" / "milestone-1"
     report_path.mkdir(parents=True, exist_ok=True)
     step_file = report_path / "S001.json"
@@ -1,11 +1,4 @@
-from fastapi.testclient import TestClient
-
-from toolrunner.app.main import app
-
-client = TestClient(app)
-
-
-def test_ui_page_contains_tabs():
+def test_ui_page_contains_tabs(client):
     response = client.get("/ui")
     assert response.status_code == 200
     body = response.text
@@ -14,7 +7,7 @@ def test_ui_page_contains_tabs():
     assert "Apprentice" in body
 
 
-def test_ui_contains_chat_elements():
+def test_ui_contains_chat_elements(client):
     response = client.get("/ui/partials/user")
     assert response.status_code == 200
     body = response.text
@@ -1,15 +1,10 @@
-import hmac
 import hashlib
+import hmac
 import json
 import time
 
-from fastapi.testclient import TestClient
-
-from toolrunner.app import app
 from toolrunner.app.config import SECRET
 
-client = TestClient(app)
-
 
 def request_signature(body: bytes, timestamp: str | None = None) -> tuple[str, str]:
     ts = timestamp or str(int(time.time()))
@@ -17,7 +12,7 @@ def request_signature(body: bytes, timestamp: str | None = None) -> tuple[str, s
     return ts, hmac.new(SECRET, message, hashlib.sha256).hexdigest()
 
 
-def test_webhook_missing_event():
+def test_webhook_missing_event(client):
     payload = {"run_id": "webhook", "tool": "webhook", "payload": {}}
     raw = json.dumps(payload).encode("utf-8")
     timestamp, signature = request_signature(raw)
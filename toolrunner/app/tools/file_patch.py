@@ -1,21 +1,38 @@
 from __future__ import annotations
 
 import hashlib
+import io
+import os
+import re
 import shutil
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path, PurePosixPath
 
 from fastapi.responses import JSONResponse
 
-import pypatch.patch as patch_parser
-
 from ..models import FilePatchArgs
 from ..sandbox import safe_join
 
 BACKUP_DIR = ".toolrunner_backups"
 REJECT_DIR = ".toolrunner_rejects"
 
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))?")
+_SOURCE_LINE = re.compile(r"^--- ([^\t]+)")
+_TARGET_LINE = re.compile(r"^\+\+\+ ([^\t]+)")
+_GIT_DIFF_LINE = re.compile(r"diff --git a/[\w/.]+ b/[\w/.]+")
+_GIT_INDEX_LINE = re.compile(r"index \w{7}..\w{7} \d{6}")
+_HG_DIFF_LINE = re.compile(r"diff -r \w{12} .*")
+_DRIVE_PREFIX = re.compile(r"\w:[\\/]")
+_DRIVE_STRIP = re.compile(r"^\w+:[\\/]+")
+_HEADER_PREFIXES = ("diff ", "--- ", "+++ ")
+_LINE_ENDINGS = frozenset({b"", b"\n", b"\r\n", b"\r"})
+# One pass over every header that names a path; the ---/+++ path ends at a tab.
+_PATH_HEADER_LINE = re.compile(
+    r"^(?:(diff --git )[^\r\n]*|(--- |\+\+\+ )([^\t\r\n]*))", re.MULTILINE
+)
+
 
 class PatchApplicationError(Exception):
     """Raised when a single patch hunk cannot be applied."""
@@ -29,6 +46,26 @@ class PatchHunk:
     new_len: int
     lines: list[str]
 
+    @cached_property
+    def ops(self) -> list[tuple[str, bytes, bytes]]:
+        """``(prefix, body, body without line ending)`` for each change line, as UTF-8."""
+        ops: list[tuple[str, bytes, bytes]] = []
+        for patch_line in self.lines:
+            # Skip blanks and metadata such as "\\ No newline at end of file".
+            if not patch_line or patch_line.startswith("\\"):
+                continue
+            body = patch_line[1:].encode("utf-8")
+            ops.append((patch_line[0], body, body.rstrip(b"\r\n")))
+        return ops
+
+
+@dataclass
+class FilePatch:
+    header: list[str]
+    source: str
+    target: str
+    hunks: list[PatchHunk]
+
 
 def _error(code: str, message: str, details: dict | None = None, status: int = 400):
     return JSONResponse(
@@ -45,36 +82,45 @@ def _error(code: str, message: str, details: dict | None = None, status: int = 4
 
 
 def _sha256(path: Path) -> str:
-    hasher = hashlib.sha256()
     with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+        return hashlib.file_digest(handle, "sha256").hexdigest()
 
 
-def _ensure_backup(target: Path, run_dir: Path) -> Path:
-    backup_dir = run_dir / BACKUP_DIR / target.parent.relative_to(run_dir)
+def _ensure_backup(target: Path, run_dir: Path, relative_dir: str, timestamp: str) -> Path:
+    backup_dir = run_dir / BACKUP_DIR / relative_dir
     backup_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    backup_path = backup_dir / f"{target.name}.{ts}.bak"
+    backup_path = backup_dir / f"{target.name}.{timestamp}.bak"
     shutil.copy2(target, backup_path)
     return backup_path
 
 
-def _write_rejects(run_dir: Path, target: Path, patch_text: str) -> Path:
-    rejects_dir = run_dir / REJECT_DIR / target.parent.relative_to(run_dir)
+def _write_rejects(
+    run_dir: Path, target: Path, relative_dir: str, timestamp: str, patch_text: str
+) -> Path:
+    rejects_dir = run_dir / REJECT_DIR / relative_dir
     rejects_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    rejects_path = rejects_dir / f"{target.name}.{ts}.rej"
+    rejects_path = rejects_dir / f"{target.name}.{timestamp}.rej"
     rejects_path.write_text(patch_text)
     return rejects_path
 
 def _ensure_diff_header(patch_text: str, path: str) -> str:
     normalized = path.replace("\\", "/")
     lines = patch_text.splitlines()
-    has_diff = any(line.startswith("diff ") for line in lines)
-    has_from = any(line.startswith("--- ") for line in lines)
-    has_to = any(line.startswith("+++ ") for line in lines)
+    has_diff = has_from = has_to = False
+    for line in lines:
+        if not line.startswith(_HEADER_PREFIXES):
+            continue
+        marker = line[0]
+        if marker == "d":
+            has_diff = True
+        elif marker == "-":
+            has_from = True
+        else:
+            has_to = True
+        if has_diff and has_from and has_to:
+            return patch_text
+    # Match the patch's own line endings so CRLF patches stay CRLF throughout.
+    eol = "\r\n" if lines and patch_text.startswith(lines[0] + "\r\n") else "\n"
     header_lines: list[str] = []
     if not has_diff:
         header_lines.append(f"diff --git a/{normalized} b/{normalized}")
@@ -82,11 +128,7 @@ def _ensure_diff_header(patch_text: str, path: str) -> str:
         header_lines.append(f"--- a/{normalized}")
     if not has_to:
         header_lines.append(f"+++ b/{normalized}")
-    if not header_lines:
-        return patch_text
-    prefix = "\n".join(header_lines)
-    suffix = "\n".join(lines)
-    return f"{prefix}\n{suffix}" if suffix else f"{prefix}\n"
+    return eol.join(header_lines) + eol + patch_text
 
 
 def _split_path_suffix(value: str) -> tuple[str, str]:
@@ -98,11 +140,12 @@ def _split_path_suffix(value: str) -> tuple[str, str]:
 
 def _split_path_parts(path: str) -> list[str]:
     normalized = path.replace("\\", "/")
-    return [
-        part
-        for part in PurePosixPath(normalized).parts
-        if part and part != "."
-    ]
+    parts = [part for part in normalized.split("/") if part and part != "."]
+    if normalized.startswith("/"):
+        # Keep the root as its own part, as PurePosixPath.parts does ("//" is distinct).
+        double = normalized.startswith("//") and not normalized.startswith("///")
+        parts.insert(0, "//" if double else "/")
+    return parts
 
 
 def _strip_path_components(path: str, strip_prefix: int) -> str:
@@ -133,35 +176,20 @@ def _rewrite_diff_line(line: str, strip_prefix: int) -> str:
 def _rewrite_patch_paths(patch_text: str, strip_prefix: int) -> str:
     if strip_prefix <= 0:
         return patch_text
-    rewritten: list[str] = []
-    for line in patch_text.splitlines(keepends=True):
-        newline = ""
-        content = line
-        if content.endswith("\r\n"):
-            newline = "\r\n"
-            content = content[:-2]
-        elif content.endswith("\n"):
-            newline = "\n"
-            content = content[:-1]
-        elif content.endswith("\r"):
-            newline = "\r"
-            content = content[:-1]
-        if content.startswith("diff --git "):
-            content = _rewrite_diff_line(content, strip_prefix)
-        elif content.startswith("--- ") or content.startswith("+++ "):
-            prefix = content[:4]
-            remainder = content[4:]
-            remainder_path, suffix = _split_path_suffix(remainder)
-            stripped_path = _strip_path_components(remainder_path, strip_prefix)
-            content = f"{prefix}{stripped_path}{suffix}"
-        rewritten.append(content + newline)
-    return "".join(rewritten)
+
+    def _rewrite(match: re.Match) -> str:
+        if match.group(1) is not None:
+            return _rewrite_diff_line(match.group(0), strip_prefix)
+        return match.group(2) + _strip_path_components(match.group(3), strip_prefix)
+
+    return _PATH_HEADER_LINE.sub(_rewrite, patch_text)
 
 
 def _detect_strip_prefix(target_path: str, patch_text: str) -> int:
     target_parts = _split_path_parts(target_path)
     if not target_parts:
         return 0
+    target_len = len(target_parts)
     for line in patch_text.splitlines():
         if not (line.startswith("--- ") or line.startswith("+++ ")):
             continue
@@ -170,92 +198,226 @@ def _detect_strip_prefix(target_path: str, patch_text: str) -> int:
         if not candidate or candidate == "/dev/null":
             continue
         candidate_parts = _split_path_parts(candidate)
-        if len(candidate_parts) < len(target_parts):
+        if len(candidate_parts) < target_len:
             continue
-        if candidate_parts[-len(target_parts) :] == target_parts:
-            prefix = len(candidate_parts) - len(target_parts)
+        if candidate_parts[-target_len:] == target_parts:
+            prefix = len(candidate_parts) - target_len
             if prefix > 0:
                 return prefix
     return 0
 
 
 def _normalize_path_for_patch(path: str) -> str:
-    candidate = PurePosixPath(path.replace("\\", "/"))
+    normalized = path.replace("\\", "/")
+    if (
+        normalized not in ("", ".")
+        and "//" not in normalized
+        and "/./" not in normalized
+        and not normalized.startswith("./")
+        and not normalized.endswith(("/", "/."))
+    ):
+        # Already in the form PurePosixPath would produce.
+        return normalized
+    candidate = PurePosixPath(normalized)
     return candidate.as_posix()
 
 
-def _parse_patch_hunks(patch_text: str, path: str) -> list[PatchHunk]:
-    patchset = patch_parser.fromstring(patch_text)
-    if not patchset:
+def _parse_hunk(lines: list[str], index: int, match: re.Match) -> tuple[PatchHunk, int]:
+    old_start = int(match.group(1))
+    old_len = int(match.group(2) or 1)
+    new_start = int(match.group(3))
+    new_len = int(match.group(4) or 1)
+    body: list[str] = []
+    seen_old = seen_new = 0
+    while True:
+        if index >= len(lines):
+            raise ValueError("patch could not be parsed")
+        line = lines[index]
+        if not line.strip("\r\n"):
+            # Editors strip trailing whitespace, leaving empty context lines behind.
+            line = " " + line
+        prefix = line[0]
+        if prefix == "-":
+            seen_old += 1
+        elif prefix == "+":
+            seen_new += 1
+        elif prefix == " ":
+            seen_old += 1
+            seen_new += 1
+        elif prefix != "\\":
+            raise ValueError("patch could not be parsed")
+        body.append(line)
+        index += 1
+        if seen_old > old_len or seen_new > new_len:
+            raise ValueError("patch could not be parsed")
+        if seen_old == old_len and seen_new == new_len:
+            return PatchHunk(old_start or 1, old_len, new_start or 1, new_len, body), index
+
+
+def _has_dvcs_prefixes(header: list[str], source: str, target: str) -> bool:
+    """Whether a/ and b/ prefixes mark this as a git or hg diff, as ``patch -p1`` assumes."""
+    if len(header) > 1 and header[-2].startswith("Index: ") and header[-1].startswith("=" * 67):
+        return False
+    if not (
+        (source.startswith("a/") or source == "/dev/null")
+        and (target.startswith("b/") or target == "/dev/null")
+    ):
+        return False
+    if len(header) > 1:
+        idx = next(
+            (i for i in reversed(range(len(header))) if header[i].startswith("diff --git")),
+            0,
+        )
+        if (
+            _GIT_DIFF_LINE.match(header[idx])
+            and idx + 1 < len(header)
+            and _GIT_INDEX_LINE.match(header[idx + 1])
+        ):
+            return True
+    if header:
+        if _HG_DIFF_LINE.match(header[-1]):
+            return True
+        if header[-1].startswith("diff --git a/"):
+            return len(header) == 1 or header[0].startswith("# HG changeset patch")
+    return False
+
+
+def _sanitize_patch_path(path: str, strip_dvcs_prefix: bool) -> str:
+    if strip_dvcs_prefix and path != "/dev/null" and path.startswith(("a/", "b/")):
+        path = path[2:]
+    path = os.path.normpath(path).replace(os.sep, "/")
+    # Parent references and absolute paths would escape the workspace; drop them.
+    while path.startswith("../"):
+        path = path.partition("/")[2]
+    while True:
+        if _DRIVE_PREFIX.match(path):
+            path = _DRIVE_STRIP.sub("", path)
+        elif path.startswith(("/", "\\")):
+            path = path.lstrip("/\\")
+        else:
+            return path
+
+
+def _parse_unified_diff(patch_text: str) -> list[FilePatch]:
+    """Split a unified diff into per-file hunks in a single pass over its lines.
+
+    Any malformed header or hunk rejects the whole patch, and git/hg ``a/``/``b/``
+    prefixes are only stripped when the header identifies such a diff.
+    """
+    # StringIO splits on "\n" only, so CRLF line endings stay on each line.
+    lines = io.StringIO(patch_text).readlines()
+    files: list[FilePatch] = []
+    header: list[str] = []
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if not line.startswith("--- "):
+            header.append(line)
+            index += 1
+            continue
+        # A repeated "--- " line restarts the file header.
+        while index + 1 < len(lines) and lines[index + 1].startswith("--- "):
+            index += 1
+        source_match = _SOURCE_LINE.match(lines[index])
+        target_match = _TARGET_LINE.match(lines[index + 1]) if index + 1 < len(lines) else None
+        if not source_match or not target_match:
+            raise ValueError("patch could not be parsed")
+        source = source_match.group(1).strip()
+        target = target_match.group(1).strip()
+        index += 2
+        hunks: list[PatchHunk] = []
+        while index < len(lines) and (match := _HUNK_HEADER.match(lines[index])):
+            hunk, index = _parse_hunk(lines, index + 1, match)
+            hunks.append(hunk)
+        if not hunks:
+            raise ValueError("patch could not be parsed")
+        strip_dvcs_prefix = _has_dvcs_prefixes(header, source, target)
+        files.append(
+            FilePatch(
+                header,
+                _sanitize_patch_path(source, strip_dvcs_prefix),
+                _sanitize_patch_path(target, strip_dvcs_prefix),
+                hunks,
+            )
+        )
+        header = []
+    if not files:
         raise ValueError("patch could not be parsed")
-    if not patchset.items:
-        raise ValueError("patch does not contain any files")
-    hunks: list[PatchHunk] = []
+    return files
+
+
+def _parse_patch_hunks(patch_text: str, path: str) -> list[PatchHunk]:
     normalized_target = _normalize_path_for_patch(path)
     filtered_items = [
         item
-        for item in patchset.items
+        for item in _parse_unified_diff(patch_text)
         if item.target and _normalize_path_for_patch(item.target) == normalized_target
     ]
     if not filtered_items:
         raise ValueError("patch does not contain hunks for the requested file")
-    for item in filtered_items:
-        for hunk in item.hunks:
-            lines = [line for line in hunk.text]
-            old_len = hunk.linessrc or sum(1 for line in lines if line.startswith(" ") or line.startswith("-"))
-            new_len = hunk.linestgt or sum(1 for line in lines if line.startswith(" ") or line.startswith("+"))
-            hunks.append(
-                PatchHunk(
-                    hunk.startsrc or 1,
-                    old_len,
-                    hunk.starttgt or 1,
-                    new_len,
-                    lines,
-                )
-            )
-    return hunks
-
-
-def _apply_hunk(lines: list[str], hunk: PatchHunk, offset: int) -> tuple[list[str], int]:
-    start = hunk.old_start - 1 + offset
-    if start < 0 or start > len(lines):
+    return [hunk for item in filtered_items for hunk in item.hunks]
+
+
+def _same_content(line: bytes, content: bytes) -> bool:
+    # ``content`` never ends in CR/LF, so this equals line.rstrip(b"\r\n") == content
+    # without copying the file line.
+    return line.startswith(content) and line[len(content) :] in _LINE_ENDINGS
+
+
+def _detect_eol(lines: list[bytes]) -> bytes | None:
+    for line in lines:
+        if line.endswith(b"\r\n"):
+            return b"\r\n"
+        if line.endswith(b"\n"):
+            return b"\n"
+    return None
+
+
+def _apply_hunk(
+    lines: list[bytes],
+    cursor: int,
+    out_lines: list[bytes],
+    hunk: PatchHunk,
+    eol: bytes | None = None,
+) -> int:
+    """Append ``lines[cursor:]`` up to and through ``hunk`` to ``out_lines``.
+
+    Returns the new cursor into ``lines``. ``out_lines`` is left untouched when
+    the hunk does not apply, so the caller can keep going from ``cursor``.
+    Added lines take ``eol`` as their line ending when it is given.
+    """
+    start = hunk.old_start - 1
+    if start < cursor or start > len(lines):
         raise PatchApplicationError("hunk start is outside the file")
     scan_idx = start
-    result_lines: list[str] = []
-    for patch_line in hunk.lines:
-        if not patch_line:
-            continue
-        if patch_line.startswith("\\"):
-            # metadata such as \"\\ No newline at end of file\" – ignore.
-            continue
-        prefix = patch_line[0]
-        body = patch_line[1:]
-        body_content = body.rstrip("\r\n")
+    result_lines: list[bytes] = []
+    for prefix, body, body_content in hunk.ops:
         if prefix == " ":
             if scan_idx >= len(lines):
                 raise PatchApplicationError("context mismatch for hunk")
             line_value = lines[scan_idx]
-            if line_value.rstrip("\r\n") != body_content:
+            if not _same_content(line_value, body_content):
                 raise PatchApplicationError("context mismatch for hunk")
             result_lines.append(line_value)
             scan_idx += 1
         elif prefix == "-":
             if scan_idx >= len(lines):
                 raise PatchApplicationError("removal did not match file")
-            line_value = lines[scan_idx]
-            if line_value.rstrip("\r\n") != body_content:
+            if not _same_content(lines[scan_idx], body_content):
                 raise PatchApplicationError("removal did not match file")
             scan_idx += 1
         elif prefix == "+":
+            if eol is not None and body != body_content:
+                body = body_content + eol
             result_lines.append(body)
         else:
             raise PatchApplicationError("unexpected patch line prefix")
     consumed = scan_idx - start
     if consumed != hunk.old_len:
         raise PatchApplicationError("hunk consumed unexpected number of lines")
-    new_lines = lines[:start] + result_lines + lines[scan_idx:]
-    delta = len(result_lines) - hunk.old_len
-    return new_lines, delta
+    out_lines.extend(lines[cursor:start])
+    out_lines.extend(result_lines)
+    return scan_idx
 
 
 def apply_patch(run_dir: Path, args: FilePatchArgs):
@@ -271,15 +433,16 @@ def apply_patch(run_dir: Path, args: FilePatchArgs):
         target.parent.mkdir(parents=True, exist_ok=True)
         target.write_text("")
 
-    if args.expected_sha256:
-        current_sha = _sha256(target)
-        if current_sha != args.expected_sha256:
-            return _error("CONFLICT", "checksum mismatch")
-
     sha_before = _sha256(target)
+    if args.expected_sha256 and sha_before != args.expected_sha256:
+        return _error("CONFLICT", "checksum mismatch")
+
+    # Backups and rejects from one call share a timestamp and directory.
+    timestamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    relative_dir = os.path.relpath(target.parent, run_dir)
     backup_path: Path | None = None
     if args.backup:
-        backup_path = _ensure_backup(target, run_dir)
+        backup_path = _ensure_backup(target, run_dir, relative_dir, timestamp)
 
     original_patch = args.patch_unified
     patch_text = _ensure_diff_header(original_patch, args.path)
@@ -293,10 +456,13 @@ def apply_patch(run_dir: Path, args: FilePatchArgs):
     except ValueError as exc:
         return _error("PATCH_FAILED", str(exc))
 
-    working_lines = target.read_text().splitlines(keepends=True)
+    # Work on the raw bytes so line endings and undecodable content survive as-is.
+    working_lines = target.read_bytes().splitlines(keepends=True)
+    eol = _detect_eol(working_lines)
+    out_lines: list[bytes] = []
+    cursor = 0
     failed_hunks: list[int] = []
     rejects_path: Path | None = None
-    offset = 0
 
     applied_hunks = 0
     stop_processing = False
@@ -305,16 +471,17 @@ def apply_patch(run_dir: Path, args: FilePatchArgs):
         if stop_processing:
             break
         try:
-            working_lines, delta = _apply_hunk(working_lines, hunk, offset)
+            cursor = _apply_hunk(working_lines, cursor, out_lines, hunk, eol)
         except PatchApplicationError:
             failed_hunks.append(idx)
             if rejects_path is None:
-                rejects_path = _write_rejects(run_dir, target, original_patch)
+                rejects_path = _write_rejects(
+                    run_dir, target, relative_dir, timestamp, original_patch
+                )
             if args.fail_on_reject:
                 stop_processing = True
             continue
         applied_hunks += 1
-        offset += delta
 
     if failed_hunks and args.fail_on_reject:
         details = {
@@ -326,9 +493,12 @@ def apply_patch(run_dir: Path, args: FilePatchArgs):
         return _error("PATCH_FAILED", "hunk(s) failed", details)
 
     if failed_hunks and rejects_path is None:
-        rejects_path = _write_rejects(run_dir, target, original_patch)
+        rejects_path = _write_rejects(
+            run_dir, target, relative_dir, timestamp, original_patch
+        )
 
-    target.write_text("".join(working_lines))
+    out_lines.extend(working_lines[cursor:])
+    target.write_bytes(b"".join(out_lines))
     sha_after = _sha256(target)
 
     applied = not failed_hunks
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import base64
+import codecs
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import IO
 
 from fastapi.responses import JSONResponse
 
@@ -11,6 +14,7 @@ from ..sandbox import safe_join
 DEFAULT_MAX_BYTES = 262144
 HARD_SIZE_LIMIT = 4 * 1024 * 1024
 MAX_LINE_RANGE = 200_000
+READ_BLOCK_SIZE = 64 * 1024
 
 
 class FileReadError(Exception):
@@ -30,6 +34,49 @@ def _error_response(code: str, message: str, details: dict | None = None, status
     )
 
 
+def _newlines_are_ascii(encoding: str) -> bool:
+    # Line breaks can be found in the raw bytes only when they encode as ASCII.
+    try:
+        return b"\r\n".decode(encoding) == "\r\n"
+    except UnicodeError:
+        return False
+
+
+def _iter_raw_lines(handle: IO[bytes]) -> Iterator[bytes]:
+    """Yield lines split on ``\n``, ``\r\n`` and ``\r``, like text-mode iteration."""
+    pending: list[bytes] = []
+    while block := handle.read(READ_BLOCK_SIZE):
+        if b"\n" not in block and b"\r" not in block:
+            pending.append(block)
+            continue
+        if pending:
+            pending.append(block)
+            block = b"".join(pending)
+            pending = []
+        lines = block.splitlines(keepends=True)
+        # A trailing "\r" may be the first half of a "\r\n" split across blocks.
+        if not lines[-1].endswith(b"\n"):
+            pending.append(lines.pop())
+        yield from lines
+    if pending:
+        # Blocks without a line break are held back unsplit; a lone "\r" may be among them.
+        yield from b"".join(pending).splitlines(keepends=True)
+
+
+def _raw_line_decoder(encoding: str) -> Callable[[bytes], str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    def decode(raw: bytes) -> str:
+        text = decoder.decode(raw, final=True)
+        if text.endswith("\r\n"):
+            return text[:-2] + "\n"
+        if text.endswith("\r"):
+            return text[:-1] + "\n"
+        return text
+
+    return decode
+
+
 def _read_text(target: Path, args: FileReadArgs) -> dict:
     start = args.start_line or 1
     end = args.end_line
@@ -38,26 +85,37 @@ def _read_text(target: Path, args: FileReadArgs) -> dict:
     truncated = False
     bytes_accum = 0
     try:
-        handle = target.open("r", encoding=args.encoding, errors="replace")
+        if _newlines_are_ascii(args.encoding):
+            decode = _raw_line_decoder(args.encoding)
+            handle = target.open("rb")
+            lines = _iter_raw_lines(handle)
+            measure = len
+        else:
+            # UTF-16/32 and friends: let the text layer find line breaks.
+            handle = target.open("r", encoding=args.encoding, errors="replace")
+            lines = iter(handle)
+            decode = str
+
+            def measure(line: str) -> int:
+                return len(line.encode(args.encoding, errors="replace"))
     except (LookupError, UnicodeError) as exc:
         raise FileReadError("UNSUPPORTED_ENCODING", str(exc))
     with handle:
-        for lineno, line in enumerate(handle, start=1):
+        for lineno, line in enumerate(lines, start=1):
             total_lines += 1
             if lineno < start:
                 continue
             if end and lineno > end:
                 total_lines = end
                 break
-            encoded = line.encode(args.encoding, errors="replace")
-            if bytes_accum + len(encoded) > args.max_bytes:
+            size = measure(line)
+            if bytes_accum + size > args.max_bytes:
                 truncated = True
-                # finish counting total lines
-                for _ in handle:
-                    total_lines += 1
+                # finish counting total lines without decoding them
+                total_lines += sum(1 for _ in lines)
                 break
-            collected.append(line)
-            bytes_accum += len(encoded)
+            collected.append(decode(line))
+            bytes_accum += size
     return {
         "path": args.path,
         "mode": "text",
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import base64
-from hashlib import sha256
+import itertools
 import os
-import tempfile
+from hashlib import file_digest, sha256
 from pathlib import Path
 
 from fastapi.responses import JSONResponse
@@ -30,11 +30,31 @@ def _sha256_bytes(data: bytes) -> str:
 
 
 def _read_existing_sha(path: Path) -> str:
-    hasher = sha256()
     with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+        return file_digest(handle, "sha256").hexdigest()
+
+
+_TEMP_COUNTER = itertools.count()
+# At most 4 UTF-8 bytes per character keeps the prefix within 128 bytes.
+_TEMP_NAME_CHARS = 32
+
+
+def _open_temp(parent: Path, name: str) -> tuple[int, Path]:
+    # pid + counter names are unique within this host; O_EXCL guards against stale files.
+    # Only a prefix of the target name is kept so long names stay under NAME_MAX.
+    stem = name[:_TEMP_NAME_CHARS]
+    while True:
+        temp_path = parent / f".{stem}.{os.getpid()}.{next(_TEMP_COUNTER)}.tmp"
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), temp_path
+        except FileExistsError:
+            continue
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
 
 
 def write_file(run_dir: Path, args: FileWriteArgs):
@@ -78,10 +98,11 @@ def write_file(run_dir: Path, args: FileWriteArgs):
     temp_path: Path | None = None
     try:
         if args.atomic:
-            temp = tempfile.NamedTemporaryFile(dir=parent, delete=False)
-            temp_path = Path(temp.name)
-            temp.close()
-            _write(temp_path)
+            fd, temp_path = _open_temp(parent, target.name)
+            try:
+                _write_fd(fd, content_bytes)
+            finally:
+                os.close(fd)
             if existed:
                 mode = target.stat().st_mode
                 os.chmod(temp_path, mode)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import re
 from pathlib import Path
 from typing import Dict, List
@@ -9,7 +8,7 @@ from fastapi.responses import JSONResponse
 
 from ..models import FormatArgs, RunCommandArgs
 from ..sandbox import safe_join
-from .run_command import run_command
+from .run_command import run_command_payload
 
 FORMAT_DEFAULT_ARGS: Dict[str, List[str]] = {
     "ruff_format": [],
@@ -17,6 +16,9 @@ FORMAT_DEFAULT_ARGS: Dict[str, List[str]] = {
     "prettier": [],
 }
 
+# "+++ <path>" diff headers; the path is trimmed like str.strip() within the line.
+_TARGET_HEADER = re.compile(r"^\+\+\+ [^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE)
+
 
 def _error_response(code: str, message: str, details: dict | None = None, status_code: int = 400):
     return JSONResponse(
@@ -60,16 +62,12 @@ def _build_command(run_dir: Path, args: FormatArgs) -> List[str]:
 
 
 def _collect_changed_files(stdout: str) -> List[str]:
-    files: List[str] = []
-    for line in stdout.splitlines():
-        if line.startswith("+++ "):
-            path = line[4:].strip()
-            if path == "/dev/null":
-                continue
-            if path.startswith("b/"):
-                path = path[2:]
-            files.append(path)
-    return sorted(set(files))
+    files = {
+        path[2:] if path.startswith("b/") else path
+        for path in _TARGET_HEADER.findall(stdout)
+        if path != "/dev/null"
+    }
+    return sorted(files)
 
 
 def run_formatter(run_dir: Path, args: FormatArgs):
@@ -84,14 +82,9 @@ def run_formatter(run_dir: Path, args: FormatArgs):
         timeout_ms=args.timeout_ms,
         max_output_bytes=args.max_output_bytes,
     )
-    response = run_command(run_dir, run_args)
-    try:
-        payload = json.loads(response.body)
-    except json.JSONDecodeError as exc:  # pragma: no cover
-        return _error_response("INTERNAL", str(exc))
-
-    if not payload.get("ok"):
-        return response
+    status_code, payload = run_command_payload(run_dir, run_args)
+    if not payload["ok"]:
+        return JSONResponse(status_code=status_code, content=payload)
 
     result = payload["result"]
     stdout = result.get("stdout", "")
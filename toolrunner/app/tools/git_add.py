@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import List
 
@@ -8,7 +7,7 @@ from fastapi.responses import JSONResponse
 
 from ..models import GitAddArgs, RunCommandArgs
 from ..sandbox import safe_join
-from .run_command import run_command
+from .run_command import run_command_payload
 
 
 def _error_response(code: str, message: str, details: dict | None = None, status_code: int = 400):
@@ -52,7 +51,7 @@ def run_git_add(run_dir: Path, args: GitAddArgs):
         command.append("--")
         command.extend(normalized_paths)
 
-    run_result = run_command(
+    status_code, payload = run_command_payload(
         repo_path,
         RunCommandArgs(
             cmd=command,
@@ -61,12 +60,8 @@ def run_git_add(run_dir: Path, args: GitAddArgs):
             max_output_bytes=args.max_output_bytes,
         ),
     )
-    try:
-        payload = json.loads(run_result.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return _error_response("INTERNAL", "failed to parse git add response")
-    if not payload.get("ok"):
-        return run_result
+    if not payload["ok"]:
+        return JSONResponse(status_code=status_code, content=payload)
 
     return JSONResponse(
         status_code=200,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
 from typing import List
 
@@ -8,7 +8,11 @@ from fastapi.responses import JSONResponse
 
 from ..models import GitApplyArgs, RunCommandArgs
 from ..sandbox import safe_join
-from .run_command import run_command
+from .file_patch import BACKUP_DIR, REJECT_DIR
+from .run_command import run_command_payload
+
+# Directories that never hold rejects written by ``git apply``.
+_SKIP_DIRS = frozenset({".git", BACKUP_DIR, REJECT_DIR})
 
 
 def _error_response(code: str, message: str, details: dict | None = None, status_code: int = 400):
@@ -27,14 +31,20 @@ def _error_response(code: str, message: str, details: dict | None = None, status
 
 def _list_reject_files(repo_path: Path) -> set[str]:
     rejects: set[str] = set()
-    for path in repo_path.rglob("*.rej"):
-        if not path.is_file():
-            continue
+    root = str(repo_path)
+    stack = [root]
+    while stack:
         try:
-            relative = path.relative_to(repo_path).as_posix()
-        except ValueError:
-            relative = path.as_posix()
-        rejects.add(relative)
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".rej") and entry.is_file():
+                    rejects.add(os.path.relpath(entry.path, root).replace(os.sep, "/"))
     return rejects
 
 
@@ -54,7 +64,7 @@ def run_git_apply(run_dir: Path, args: GitApplyArgs):
 
     pre_rejects = _list_reject_files(repo_path) if args.reject else set()
 
-    run_result = run_command(
+    status_code, payload = run_command_payload(
         repo_path,
         RunCommandArgs(
             cmd=command,
@@ -64,13 +74,8 @@ def run_git_apply(run_dir: Path, args: GitApplyArgs):
             stdin_text=args.patch_unified,
         ),
     )
-
-    try:
-        payload = json.loads(run_result.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return _error_response("INTERNAL", "failed to parse git apply response")
-    if not payload.get("ok"):
-        return run_result
+    if not payload["ok"]:
+        return JSONResponse(status_code=status_code, content=payload)
 
     result_payload = payload["result"]
     exit_code = result_payload.get("exit_code")
@@ -31,7 +31,7 @@ def _error_response(
 
 def _decode_result(response: JSONResponse) -> dict | None:
     try:
-        return json.loads(response.body.decode("utf-8"))
+        return json.loads(response.body)
     except Exception:
         return None
 
@@ -87,10 +87,10 @@ def run_git_log(run_dir: Path, args: GitLogArgs):
     for line in stdout.splitlines():
         if not line:
             continue
-        parts = line.split("\x00")
-        if len(parts) < 5:
+        parts = line.split("\x00", 4)
+        if len(parts) != 5:
             continue
-        oid, author_name, author_email, author_time, subject = parts[:5]
+        oid, author_name, author_email, author_time, subject = parts
         try:
             author_time_epoch = int(author_time)
         except ValueError:
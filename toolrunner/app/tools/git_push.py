@@ -49,7 +49,7 @@ def run_git_push(run_dir: Path, args: GitPushArgs):
         ),
     )
     try:
-        payload = json.loads(run_result.body.decode("utf-8"))
+        payload = json.loads(run_result.body)
     except json.JSONDecodeError:
         return _error_response("INTERNAL", "failed to parse git push response")
     if not payload.get("ok"):
@@ -33,13 +33,15 @@ _FIELD_SPLITS = {"1": 8, "2": 9, "u": 8}
 
 
 def _normalize_newlines(text: str) -> str:
+    # Porcelain output is LF-only in the common case; skip the copy then.
+    if "\r" not in text:
+        return text
     return text.replace("\r\n", "\n")
 
 
 def _extract_path(line: str, maxsplit: int) -> str:
-    trimmed = line.split("\t", 1)[0]
-    parts = trimmed.split(" ", maxsplit)
-    return parts[-1] if parts else ""
+    # The path is the last space-delimited field; rename records append "\t<orig>".
+    return line.split(" ", maxsplit)[-1].partition("\t")[0]
 
 
 def _parse_branch_line(line: str, branch_info: dict) -> None:
@@ -87,18 +89,17 @@ def _parse_status_lines(
         "behind": 0,
     }
 
-    for raw_line in stdout.splitlines():
-        line = raw_line.rstrip("\r\n")
+    for line in stdout.splitlines():
         if not line:
             continue
-        if line.startswith("#"):
+        prefix = line[0]
+        if prefix == "#":
             _parse_branch_line(line, branch_info)
             continue
-        if line.startswith("? "):
+        if prefix == "?" and line[1:2] == " ":
             if include_untracked:
                 untracked.append(line[2:])
             continue
-        prefix = line[0]
         fields = _FIELD_SPLITS.get(prefix, 8)
         if prefix in {"1", "2"}:
             path = _extract_path(line, fields)
@@ -138,7 +139,7 @@ def run_git_status(run_dir: Path, args: GitStatusArgs):
     )
 
     try:
-        payload = json.loads(run_result.body.decode("utf-8"))
+        payload = json.loads(run_result.body)
     except Exception:
         return _error_response("INTERNAL", "failed to parse git status output")
 
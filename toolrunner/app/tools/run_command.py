@@ -11,23 +11,20 @@ from ..models import RunCommandArgs
 from ..sandbox import safe_join
 
 
-def _error_response(
+def _error_payload(
     code: str,
     message: str,
     details: dict | None = None,
     status_code: int = 400,
-):
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "ok": False,
-            "error": {
-                "code": f"tool_runner.{code}",
-                "message": message,
-                "details": details or {},
-            },
+) -> tuple[int, dict]:
+    return status_code, {
+        "ok": False,
+        "error": {
+            "code": f"tool_runner.{code}",
+            "message": message,
+            "details": details or {},
         },
-    )
+    }
 
 
 def _truncate_output(payload: bytes | str | None, max_bytes: int) -> tuple[str, bool]:
@@ -74,13 +71,18 @@ def _terminate_tree(proc: subprocess.Popen):
             pass
 
 
-def run_command(run_dir: Path, args: RunCommandArgs):
+def run_command_payload(run_dir: Path, args: RunCommandArgs) -> tuple[int, dict]:
+    """Run ``args.cmd`` and return ``(status_code, envelope)`` without rendering it.
+
+    Tools that post-process the command result call this directly so the
+    envelope is not serialized and parsed back before they repackage it.
+    """
     try:
         working_dir = safe_join(run_dir, args.cwd or ".")
     except ValueError as exc:
-        return _error_response("PATH_OUTSIDE_WORKSPACE", str(exc))
+        return _error_payload("PATH_OUTSIDE_WORKSPACE", str(exc))
     if not working_dir.exists():
-        return _error_response(
+        return _error_payload(
             "NOT_FOUND",
             f"working directory '{args.cwd}' does not exist",
             {"cwd": args.cwd},
@@ -132,17 +134,17 @@ def run_command(run_dir: Path, args: RunCommandArgs):
                         pass
             exit_code = None
     except FileNotFoundError as exc:
-        return _error_response(
+        return _error_payload(
             "NOT_FOUND",
             str(exc),
             {"cmd0": args.cmd[0] if args.cmd else None},
         )
     except PermissionError as exc:
-        return _error_response("PERMISSION_DENIED", str(exc))
+        return _error_payload("PERMISSION_DENIED", str(exc))
     except ValueError as exc:
-        return _error_response("INVALID_ARGUMENT", str(exc))
+        return _error_payload("INVALID_ARGUMENT", str(exc))
     except OSError as exc:
-        return _error_response("INVALID_ARGUMENT", str(exc))
+        return _error_payload("INVALID_ARGUMENT", str(exc))
     finally:
         duration_ms = int(round((time.monotonic() - start) * 1000))
 
@@ -157,4 +159,9 @@ def run_command(run_dir: Path, args: RunCommandArgs):
         "stdout_truncated": stdout_truncated,
         "stderr_truncated": stderr_truncated,
     }
-    return JSONResponse(status_code=200, content={"ok": True, "result": result})
+    return 200, {"ok": True, "result": result}
+
+
+def run_command(run_dir: Path, args: RunCommandArgs):
+    status_code, content = run_command_payload(run_dir, args)
+    return JSONResponse(status_code=status_code, content=content)